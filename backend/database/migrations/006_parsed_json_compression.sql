@@ -0,0 +1,13 @@
+-- ================================================
+-- Parsed JSON Compression
+-- Version: 006
+-- Description: Compress parsed CV/job JSON with LZ4 TOAST compression
+-- ================================================
+
+-- parsed_json holds 3-15 KB of highly redundant JSON (repeated keys, enum values).
+-- LZ4 compresses faster than the default pglz and the columns stay JSONB, so
+-- existing readers and jsonb operators are unaffected.
+-- Applies to newly written values; existing rows are recompressed when next updated.
+ALTER TABLE cv_versions ALTER COLUMN parsed_json SET COMPRESSION lz4;
+ALTER TABLE job_postings ALTER COLUMN parsed_json SET COMPRESSION lz4;
+ALTER TABLE discovered_jobs ALTER COLUMN parsed_json SET COMPRESSION lz4;
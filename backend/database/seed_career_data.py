@@ -4,10 +4,15 @@ Seed data for CareerAssist
 Loads sample CV templates, interview questions, and testing data
 """
 
+import functools
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
 
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from dotenv import load_dotenv
 
@@ -24,282 +29,74 @@ if not cluster_arn or not secret_arn:
     print("❌ Missing AURORA_CLUSTER_ARN or AURORA_SECRET_ARN in .env file")
     exit(1)
 
-client = boto3.client("rds-data", region_name=region)
+# One pooled client shared by every helper; adaptive retries ride out Data API throttling
+client = boto3.client(
+    "rds-data",
+    region_name=region,
+    config=Config(max_pool_connections=32, retries={"mode": "adaptive", "max_attempts": 10}, tcp_keepalive=True),
+)
+
+# Connection arguments shared by every Data API call
+_BASE_KWARGS = {"resourceArn": cluster_arn, "secretArn": secret_arn, "database": database}
+
+# Parameter sets per batch_execute_statement call; keeps each request well under the Data API size limits
+BATCH_SIZE = 25
 
 
 # ==============================================================================
-# Sample CV Templates (for testing and demonstration)
+# Sample CVs and Job Postings (for testing and demonstration)
 # ==============================================================================
 
-SAMPLE_CVS = [
-    {
-        "version_name": "Software Engineer",
-        "raw_text": """
-JOHN DOE
-Software Engineer | john.doe@email.com | (555) 123-4567
-San Francisco, CA | linkedin.com/in/johndoe | github.com/johndoe
-
-PROFESSIONAL SUMMARY
-Experienced software engineer with 5+ years of experience building scalable web applications.
-Proficient in Python, JavaScript, and cloud technologies. Passionate about clean code and
-test-driven development.
-
-TECHNICAL SKILLS
-Languages: Python, JavaScript, TypeScript, Java, SQL
-Frameworks: React, Node.js, Django, FastAPI, Flask
-Cloud: AWS (EC2, Lambda, S3, RDS), GCP, Docker, Kubernetes
-Databases: PostgreSQL, MongoDB, Redis
-Tools: Git, Jenkins, Terraform, GitHub Actions
-
-WORK EXPERIENCE
-
-Senior Software Engineer | TechCorp Inc. | Jan 2022 - Present
-- Led development of microservices architecture serving 500K+ daily users
-- Reduced API response time by 40% through Redis caching implementation
-- Mentored team of 3 junior developers, conducting code reviews and pair programming
-- Implemented CI/CD pipeline reducing deployment time from 2 hours to 15 minutes
-
-Software Engineer | StartupXYZ | Jun 2019 - Dec 2021
-- Built real-time data pipeline processing 1M+ events/day using Kafka and Spark
-- Developed React frontend with TypeScript, achieving 95% code coverage
-- Designed and implemented RESTful APIs serving mobile and web clients
-- Collaborated with product team to define technical requirements
-
-Junior Developer | WebAgency | Mar 2018 - May 2019
-- Developed responsive web applications using React and Node.js
-- Maintained and improved legacy PHP codebases
-- Participated in agile ceremonies and sprint planning
-
-EDUCATION
-B.S. Computer Science | University of California, Berkeley | 2018
-GPA: 3.7/4.0 | Dean's List
-
-CERTIFICATIONS
-- AWS Solutions Architect Associate (2023)
-- Kubernetes Administrator (CKA) (2022)
-""",
-        "parsed_json": {
-            "name": "John Doe",
-            "email": "john.doe@email.com",
-            "phone": "(555) 123-4567",
-            "location": "San Francisco, CA",
-            "linkedin_url": "linkedin.com/in/johndoe",
-            "github_url": "github.com/johndoe",
-            "summary": "Experienced software engineer with 5+ years of experience building scalable web applications.",
-            "total_years_experience": 5,
-            "skills": [
-                {"name": "Python", "proficiency": "expert", "years": 5},
-                {"name": "JavaScript", "proficiency": "expert", "years": 5},
-                {"name": "React", "proficiency": "proficient", "years": 4},
-                {"name": "AWS", "proficiency": "proficient", "years": 3},
-                {"name": "Docker", "proficiency": "proficient", "years": 3},
-                {"name": "PostgreSQL", "proficiency": "proficient", "years": 4},
-            ],
-            "experience": [
-                {
-                    "company": "TechCorp Inc.",
-                    "role": "Senior Software Engineer",
-                    "start_date": "2022-01",
-                    "end_date": "Present",
-                    "is_current": True,
-                }
-            ],
-        },
-    },
-    {
-        "version_name": "Data Scientist",
-        "raw_text": """
-SARAH JOHNSON
-Data Scientist | sarah.johnson@email.com | (555) 987-6543
-New York, NY | linkedin.com/in/sarahjohnson
-
-PROFESSIONAL SUMMARY
-Data Scientist with 4 years of experience in machine learning, statistical analysis, and
-data visualization. Expert in developing predictive models and extracting insights from
-complex datasets to drive business decisions.
-
-TECHNICAL SKILLS
-Languages: Python, R, SQL, Scala
-ML/AI: TensorFlow, PyTorch, Scikit-learn, XGBoost, Keras
-Data: Pandas, NumPy, Apache Spark, Hadoop
-Visualization: Tableau, Power BI, Matplotlib, Seaborn
-Cloud: AWS SageMaker, Azure ML, GCP AI Platform
-Statistics: Hypothesis Testing, A/B Testing, Time Series Analysis
-
-WORK EXPERIENCE
-
-Senior Data Scientist | FinanceAI Corp | Mar 2022 - Present
-- Built fraud detection model reducing false positives by 35% using ensemble methods
-- Developed customer churn prediction system saving $2M annually
-- Led team of 2 data scientists on NLP project for sentiment analysis
-- Created automated reporting dashboards for C-level executives
-
-Data Scientist | DataDriven Inc. | Jul 2020 - Feb 2022
-- Implemented recommendation engine increasing user engagement by 25%
-- Built ETL pipelines processing 50GB+ of daily data
-- Conducted A/B tests for feature launches with statistical rigor
-- Presented findings to stakeholders and translated insights to action items
-
-Data Analyst | RetailCo | Jun 2019 - Jun 2020
-- Analyzed customer behavior patterns using SQL and Python
-- Created Tableau dashboards for sales performance tracking
-- Automated weekly reporting saving 10 hours per week
-
-EDUCATION
-M.S. Data Science | Columbia University | 2019
-B.S. Statistics | NYU | 2017
-
-PUBLICATIONS
-- "Ensemble Methods for Fraud Detection" - Journal of ML Research (2023)
-
-CERTIFICATIONS
-- AWS Machine Learning Specialty (2023)
-- Google Professional Data Engineer (2022)
-""",
-        "parsed_json": {
-            "name": "Sarah Johnson",
-            "email": "sarah.johnson@email.com",
-            "phone": "(555) 987-6543",
-            "location": "New York, NY",
-            "linkedin_url": "linkedin.com/in/sarahjohnson",
-            "summary": "Data Scientist with 4 years of experience in machine learning and statistical analysis.",
-            "total_years_experience": 4,
-            "skills": [
-                {"name": "Python", "proficiency": "expert", "years": 4},
-                {"name": "Machine Learning", "proficiency": "expert", "years": 4},
-                {"name": "TensorFlow", "proficiency": "proficient", "years": 3},
-                {"name": "SQL", "proficiency": "expert", "years": 4},
-                {"name": "AWS SageMaker", "proficiency": "proficient", "years": 2},
-            ],
-        },
-    },
-]
+# Raw texts and parsed JSON live in sample_data/ and are only read when seeding
+SAMPLE_DATA_DIR = Path(__file__).parent / "sample_data"
 
 
-# ==============================================================================
-# Sample Job Postings (for testing)
-# ==============================================================================
+@dataclass(slots=True, frozen=True)
+class CVSeed:
+    """One sample CV version"""
 
-SAMPLE_JOBS = [
-    {
-        "company_name": "TechStartup",
-        "role_title": "Senior Backend Engineer",
-        "location": "San Francisco, CA",
-        "remote_policy": "hybrid",
-        "salary_min": 150000,
-        "salary_max": 200000,
-        "raw_text": """
-Senior Backend Engineer - TechStartup
-
-About Us:
-TechStartup is a fast-growing company revolutionizing the fintech space. We're looking for
-passionate engineers to join our team.
-
-Role:
-We're seeking a Senior Backend Engineer to design and build scalable systems that power
-our financial platform.
-
-Requirements:
-- 5+ years of backend development experience
-- Strong proficiency in Python or Go
-- Experience with microservices architecture
-- Solid understanding of SQL and NoSQL databases
-- Experience with cloud platforms (AWS preferred)
-- Excellent problem-solving skills
-- Strong communication abilities
-
-Nice to Have:
-- Experience in fintech or financial services
-- Knowledge of Kubernetes and Docker
-- Experience with event-driven architecture
-- Contributions to open source projects
-
-Responsibilities:
-- Design and implement scalable backend services
-- Lead technical design discussions
-- Mentor junior engineers
-- Collaborate with product and frontend teams
-- Participate in on-call rotation
-
-Benefits:
-- Competitive salary + equity
-- Health, dental, vision insurance
-- 401k with matching
-- Unlimited PTO
-- Remote work flexibility
-""",
-        "parsed_json": {
-            "company": "TechStartup",
-            "role_title": "Senior Backend Engineer",
-            "seniority": "senior",
-            "location": "San Francisco, CA",
-            "remote_policy": "hybrid",
-            "must_have": [
-                {"text": "5+ years of backend development experience", "type": "must_have", "category": "experience"},
-                {"text": "Strong proficiency in Python or Go", "type": "must_have", "category": "technical"},
-                {"text": "Experience with microservices architecture", "type": "must_have", "category": "technical"},
-                {
-                    "text": "Solid understanding of SQL and NoSQL databases",
-                    "type": "must_have",
-                    "category": "technical",
-                },
-                {
-                    "text": "Experience with cloud platforms (AWS preferred)",
-                    "type": "must_have",
-                    "category": "technical",
-                },
-            ],
-            "nice_to_have": [
-                {"text": "Experience in fintech or financial services", "type": "nice_to_have", "category": "domain"},
-                {"text": "Knowledge of Kubernetes and Docker", "type": "nice_to_have", "category": "technical"},
-                {"text": "Experience with event-driven architecture", "type": "nice_to_have", "category": "technical"},
-            ],
-            "ats_keywords": ["Python", "Go", "microservices", "AWS", "SQL", "NoSQL", "backend", "scalable"],
-        },
-    },
-    {
-        "company_name": "DataCorp",
-        "role_title": "Machine Learning Engineer",
-        "location": "Remote",
-        "remote_policy": "remote",
-        "salary_min": 160000,
-        "salary_max": 220000,
-        "raw_text": """
-Machine Learning Engineer - DataCorp
-
-Join our AI team building the future of intelligent systems!
-
-Requirements:
-- MS/PhD in Computer Science, Machine Learning, or related field
-- 3+ years of experience in ML/AI
-- Expert knowledge of Python and ML frameworks (TensorFlow, PyTorch)
-- Experience deploying ML models to production
-- Strong foundation in statistics and mathematics
-- Experience with large-scale data processing
-- Excellent communication skills
-
-Nice to Have:
-- Experience with LLMs and NLP
-- Published research papers
-- Open source contributions
-- Experience with MLOps tools (MLflow, Kubeflow)
-
-What You'll Do:
-- Develop and deploy machine learning models at scale
-- Research and implement state-of-the-art ML techniques
-- Collaborate with data scientists and engineers
-- Build ML pipelines and infrastructure
-- Present findings to stakeholders
-
-Benefits:
-- Fully remote position
-- Top-tier compensation
-- Stock options
-- Learning budget
-- Flexible hours
-""",
-    },
-]
+    version_name: str
+    raw_text: str
+    parsed_json_str: str
+
+
+@dataclass(slots=True, frozen=True)
+class JobSeed:
+    """One sample job posting"""
+
+    company_name: str
+    role_title: str
+    location: str
+    remote_policy: str
+    raw_text: str
+    parsed_json_str: str
+    salary_min: int = 0
+    salary_max: int = 0
+
+
+def _load_samples(manifest: str, record_type: type) -> tuple:
+    """
+    Load a sample manifest into records, filling each raw_text from its text file
+    and serializing its parsed_json once for the insert parameters
+    """
+    records = []
+    for sample in json.loads((SAMPLE_DATA_DIR / manifest).read_bytes()):
+        raw_text = (SAMPLE_DATA_DIR / sample.pop("raw_text_file")).read_text()
+        parsed_json_str = json.dumps(sample.pop("parsed_json", {}))
+        records.append(record_type(**sample, raw_text=raw_text, parsed_json_str=parsed_json_str))
+    return tuple(records)
+
+
+@functools.cache
+def load_sample_cvs() -> tuple[CVSeed, ...]:
+    """Sample CV versions"""
+    return _load_samples("cvs.json", CVSeed)
+
+
+@functools.cache
+def load_sample_jobs() -> tuple[JobSeed, ...]:
+    """Sample job postings"""
+    return _load_samples("jobs.json", JobSeed)
 
 
 # ==============================================================================
@@ -319,27 +116,81 @@ SAMPLE_SKILL_CATEGORIES = [
     {"name": "React", "category_type": "tool", "aliases": ["ReactJS", "React.js"]},
 ]
 
+# The aliases are constant, so serialize them once
+for skill in SAMPLE_SKILL_CATEGORIES:
+    skill["aliases_json"] = json.dumps(skill["aliases"])
+
+
+# ==============================================================================
+# SQL Statements
+# ==============================================================================
+
+_SQL_SELECT_USER = "SELECT id FROM user_profiles WHERE clerk_user_id = :clerk_id"
+
+_SQL_INSERT_USER = """
+    INSERT INTO user_profiles (clerk_user_id, full_name, email, target_roles, target_locations, years_of_experience)
+    VALUES (:clerk_id, :name, :email, :roles::jsonb, :locations::jsonb, :years)
+    RETURNING id
+"""
+
+_SQL_INSERT_CV = """
+    INSERT INTO cv_versions (user_id, raw_text, parsed_json, version_name, is_primary)
+    VALUES (:user_id::uuid, :raw_text, :parsed_json::jsonb, :version_name, :is_primary)
+    ON CONFLICT DO NOTHING
+"""
+
+_SQL_INSERT_JOB = """
+    INSERT INTO job_postings (user_id, company_name, role_title, raw_text, parsed_json,
+                              location, remote_policy, salary_min, salary_max)
+    VALUES (:user_id::uuid, :company, :role, :raw_text, :parsed_json::jsonb,
+            :location, :remote, :salary_min, :salary_max)
+"""
+
+# One multi-row upsert: a single statement to parse and plan (3 parameters per row)
+_SQL_INSERT_SKILLS = f"""
+    INSERT INTO skill_categories (name, category_type, aliases)
+    VALUES {", ".join(f"(:n{i}, :t{i}, :a{i}::jsonb)" for i in range(len(SAMPLE_SKILL_CATEGORIES)))}
+    ON CONFLICT (name) DO UPDATE SET
+        category_type = EXCLUDED.category_type,
+        aliases = EXCLUDED.aliases
+"""
+
 
 # ==============================================================================
 # Database Operations
 # ==============================================================================
 
 
-def execute_sql(sql: str, parameters: list = None) -> dict:
+def execute_sql(sql: str, parameters: list = None, transaction_id: str = None) -> dict:
     """Execute a SQL statement"""
+    kwargs = {"parameters": parameters} if parameters else {}
+    if transaction_id:
+        kwargs["transactionId"] = transaction_id
+    try:
+        return client.execute_statement(**_BASE_KWARGS, sql=sql, **kwargs)
+    except ClientError as e:
+        print(f"    ❌ Error: {e.response['Error']['Message'][:200]}")
+        return None
+
+
+def execute_batch(sql: str, parameter_sets: list[list], transaction_id: str = None) -> int:
+    """
+    Execute one SQL statement for many parameter sets, BATCH_SIZE sets per Data API call.
+    Returns the number of parameter sets executed, or None on error. Inside a transaction
+    the error is re-raised instead: it aborts the transaction, which must be rolled back
+    """
+    kwargs = {"transactionId": transaction_id} if transaction_id else {}
     try:
-        kwargs = {
-            "resourceArn": cluster_arn,
-            "secretArn": secret_arn,
-            "database": database,
-            "sql": sql,
-        }
-        if parameters:
-            kwargs["parameters"] = parameters
-        return client.execute_statement(**kwargs)
+        for start in range(0, len(parameter_sets), BATCH_SIZE):
+            client.batch_execute_statement(
+                **_BASE_KWARGS, sql=sql, parameterSets=parameter_sets[start : start + BATCH_SIZE], **kwargs
+            )
     except ClientError as e:
         print(f"    ❌ Error: {e.response['Error']['Message'][:200]}")
+        if transaction_id:
+            raise
         return None
+    return len(parameter_sets)
 
 
 def create_test_user() -> str:
@@ -347,9 +198,8 @@ def create_test_user() -> str:
     print("\n👤 Creating test user...")
 
     # Check if test user exists
-    sql = "SELECT id FROM user_profiles WHERE clerk_user_id = :clerk_id"
     params = [{"name": "clerk_id", "value": {"stringValue": "test_user_001"}}]
-    result = execute_sql(sql, params)
+    result = execute_sql(_SQL_SELECT_USER, params)
 
     if result and result.get("records"):
         user_id = result["records"][0][0]["stringValue"]
@@ -357,11 +207,6 @@ def create_test_user() -> str:
         return user_id
 
     # Create new test user
-    sql = """
-        INSERT INTO user_profiles (clerk_user_id, full_name, email, target_roles, target_locations, years_of_experience)
-        VALUES (:clerk_id, :name, :email, :roles::jsonb, :locations::jsonb, :years)
-        RETURNING id
-    """
     params = [
         {"name": "clerk_id", "value": {"stringValue": "test_user_001"}},
         {"name": "name", "value": {"stringValue": "Test User"}},
@@ -370,7 +215,7 @@ def create_test_user() -> str:
         {"name": "locations", "value": {"stringValue": '["San Francisco", "Remote"]'}},
         {"name": "years", "value": {"longValue": 5}},
     ]
-    result = execute_sql(sql, params)
+    result = execute_sql(_SQL_INSERT_USER, params)
 
     if result and result.get("records"):
         user_id = result["records"][0][0]["stringValue"]
@@ -381,81 +226,78 @@ def create_test_user() -> str:
     return None
 
 
-def seed_cv_versions(user_id: str):
+def seed_cv_versions(user_id: str, transaction_id: str = None):
     """Seed sample CV versions"""
     print("\n📄 Seeding CV versions...")
 
-    for i, cv in enumerate(SAMPLE_CVS):
-        sql = """
-            INSERT INTO cv_versions (user_id, raw_text, parsed_json, version_name, is_primary)
-            VALUES (:user_id::uuid, :raw_text, :parsed_json::jsonb, :version_name, :is_primary)
-            ON CONFLICT DO NOTHING
-            RETURNING id
-        """
-        params = [
+    sample_cvs = load_sample_cvs()
+    parameter_sets = [
+        [
             {"name": "user_id", "value": {"stringValue": user_id}},
-            {"name": "raw_text", "value": {"stringValue": cv["raw_text"]}},
-            {"name": "parsed_json", "value": {"stringValue": json.dumps(cv["parsed_json"])}},
-            {"name": "version_name", "value": {"stringValue": cv["version_name"]}},
+            {"name": "raw_text", "value": {"stringValue": cv.raw_text}},
+            {"name": "parsed_json", "value": {"stringValue": cv.parsed_json_str}},
+            {"name": "version_name", "value": {"stringValue": cv.version_name}},
             {"name": "is_primary", "value": {"booleanValue": i == 0}},  # First one is primary
         ]
-        result = execute_sql(sql, params)
-        if result:
-            print(f"    ✅ {cv['version_name']}")
-        else:
-            print(f"    ⏭️  {cv['version_name']} (already exists or error)")
+        for i, cv in enumerate(sample_cvs)
+    ]
+    result = execute_batch(_SQL_INSERT_CV, parameter_sets, transaction_id)
+    if result is not None:
+        print("\n".join(f"    ✅ {cv.version_name}" for cv in sample_cvs))
+    else:
+        print("\n".join(f"    ⏭️  {cv.version_name} (already exists or error)" for cv in sample_cvs))
 
 
-def seed_job_postings(user_id: str):
+def seed_job_postings(user_id: str, transaction_id: str = None):
     """Seed sample job postings"""
     print("\n💼 Seeding job postings...")
 
-    for job in SAMPLE_JOBS:
-        sql = """
-            INSERT INTO job_postings (user_id, company_name, role_title, raw_text, parsed_json,
-                                      location, remote_policy, salary_min, salary_max)
-            VALUES (:user_id::uuid, :company, :role, :raw_text, :parsed_json::jsonb,
-                    :location, :remote, :salary_min, :salary_max)
-            RETURNING id
-        """
-        params = [
+    sample_jobs = load_sample_jobs()
+    parameter_sets = [
+        [
             {"name": "user_id", "value": {"stringValue": user_id}},
-            {"name": "company", "value": {"stringValue": job["company_name"]}},
-            {"name": "role", "value": {"stringValue": job["role_title"]}},
-            {"name": "raw_text", "value": {"stringValue": job["raw_text"]}},
-            {"name": "parsed_json", "value": {"stringValue": json.dumps(job.get("parsed_json", {}))}},
-            {"name": "location", "value": {"stringValue": job["location"]}},
-            {"name": "remote", "value": {"stringValue": job["remote_policy"]}},
-            {"name": "salary_min", "value": {"longValue": job.get("salary_min", 0)}},
-            {"name": "salary_max", "value": {"longValue": job.get("salary_max", 0)}},
+            {"name": "company", "value": {"stringValue": job.company_name}},
+            {"name": "role", "value": {"stringValue": job.role_title}},
+            {"name": "raw_text", "value": {"stringValue": job.raw_text}},
+            {"name": "parsed_json", "value": {"stringValue": job.parsed_json_str}},
+            {"name": "location", "value": {"stringValue": job.location}},
+            {"name": "remote", "value": {"stringValue": job.remote_policy}},
+            {"name": "salary_min", "value": {"longValue": job.salary_min}},
+            {"name": "salary_max", "value": {"longValue": job.salary_max}},
         ]
-        result = execute_sql(sql, params)
-        if result:
-            print(f"    ✅ {job['company_name']} - {job['role_title']}")
-        else:
-            print(f"    ❌ Failed: {job['company_name']}")
-
-
-def seed_skill_categories():
-    """Seed skill categories reference data"""
-    print("\n🏷️  Seeding skill categories...")
-
-    for skill in SAMPLE_SKILL_CATEGORIES:
-        sql = """
-            INSERT INTO skill_categories (name, category_type, aliases)
-            VALUES (:name, :type, :aliases::jsonb)
-            ON CONFLICT (name) DO UPDATE SET
-                category_type = EXCLUDED.category_type,
-                aliases = EXCLUDED.aliases
-        """
-        params = [
-            {"name": "name", "value": {"stringValue": skill["name"]}},
-            {"name": "type", "value": {"stringValue": skill["category_type"]}},
-            {"name": "aliases", "value": {"stringValue": json.dumps(skill["aliases"])}},
+        for job in sample_jobs
+    ]
+    result = execute_batch(_SQL_INSERT_JOB, parameter_sets, transaction_id)
+    if result is not None:
+        print("\n".join(f"    ✅ {job.company_name} - {job.role_title}" for job in sample_jobs))
+    else:
+        print("\n".join(f"    ❌ Failed: {job.company_name}" for job in sample_jobs))
+
+
+def seed_skill_categories(transaction_id: str = None) -> list[str]:
+    """
+    Seed skill categories reference data.
+    Runs on a worker thread, so it returns its progress lines for main() to print
+    instead of printing them between the user data output
+    """
+    lines = ["\n🏷️  Seeding skill categories..."]
+
+    parameters = []
+    for i, skill in enumerate(SAMPLE_SKILL_CATEGORIES):
+        parameters += [
+            {"name": f"n{i}", "value": {"stringValue": skill["name"]}},
+            {"name": f"t{i}", "value": {"stringValue": skill["category_type"]}},
+            {"name": f"a{i}", "value": {"stringValue": skill["aliases_json"]}},
         ]
-        result = execute_sql(sql, params)
-        if result:
-            print(f"    ✅ {skill['name']} ({skill['category_type']})")
+    kwargs = {"transactionId": transaction_id} if transaction_id else {}
+    try:
+        client.execute_statement(**_BASE_KWARGS, sql=_SQL_INSERT_SKILLS, parameters=parameters, **kwargs)
+    except ClientError as e:
+        lines.append(f"    ❌ Error: {e.response['Error']['Message'][:200]}")
+        return lines
+
+    lines += [f"    ✅ {skill['name']} ({skill['category_type']})" for skill in SAMPLE_SKILL_CATEGORIES]
+    return lines
 
 
 def verify_data():
@@ -469,12 +311,12 @@ def verify_data():
         ("skill_categories", "Skill categories"),
     ]
 
-    for table, name in tables:
-        sql = f"SELECT COUNT(*) as count FROM {table}"
-        result = execute_sql(sql)
-        if result and result.get("records"):
-            count = result["records"][0][0]["longValue"]
-            print(f"    {name}: {count} records")
+    # Every count in one round-trip
+    sql = " UNION ALL ".join(f"SELECT '{table}' AS name, COUNT(*) AS count FROM {table}" for table, _ in tables)
+    result = execute_sql(sql)
+    if result and result.get("records"):
+        counts = {row[0]["stringValue"]: row[1]["longValue"] for row in result["records"]}
+        print("\n".join(f"    {name}: {counts.get(table, 0)} records" for table, name in tables))
 
 
 def main():
@@ -483,16 +325,31 @@ def main():
     print(f"Database: {database}")
     print(f"Region: {region}")
 
-    # Create test user
-    user_id = create_test_user()
-    if not user_id:
-        print("\n❌ Cannot proceed without test user")
-        exit(1)
-
-    # Seed data
-    seed_cv_versions(user_id)
-    seed_job_postings(user_id)
-    seed_skill_categories()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        # Skill categories are idempotent reference data with no user dependency,
+        # so upsert them alongside the user-owned seed data
+        skills_seeded = executor.submit(seed_skill_categories)
+
+        # Create test user
+        user_id = create_test_user()
+        if not user_id:
+            print("\n❌ Cannot proceed without test user")
+            exit(1)
+
+        # User data: one batched statement per table, committed together. A Data API
+        # transaction runs on one connection, so these two stay sequential
+        response = client.begin_transaction(**_BASE_KWARGS)
+        transaction_id = response["transactionId"]
+        try:
+            seed_cv_versions(user_id, transaction_id)
+            seed_job_postings(user_id, transaction_id)
+        except Exception:
+            client.rollback_transaction(resourceArn=cluster_arn, secretArn=secret_arn, transactionId=transaction_id)
+            print("\n❌ Seeding failed; CV versions and job postings were rolled back")
+            raise
+        client.commit_transaction(resourceArn=cluster_arn, secretArn=secret_arn, transactionId=transaction_id)
+
+        print("\n".join(skills_seeded.result()))
 
     # Verify
     verify_data()
@@ -11,6 +11,7 @@ from decimal import Decimal
 from typing import Any
 
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 # Try to load .env file if it exists
@@ -54,7 +55,12 @@ class DataAPIClient:
             )
 
         self.region = os.environ.get("DEFAULT_AWS_REGION", "us-east-1")
-        self.client = boto3.client("rds-data", region_name=self.region)
+        # Keep-alive pooled connections are reused across calls on warm Lambda invocations
+        self.client = boto3.client(
+            "rds-data",
+            region_name=self.region,
+            config=Config(max_pool_connections=10, tcp_keepalive=True),
+        )
 
     def execute(self, sql: str, parameters: list[dict] = None) -> dict:
         """
@@ -175,7 +181,9 @@ class DataAPIClient:
             return self._extract_value(response["records"][0][0])
         return None
 
-    def update(self, table: str, data: dict, where: str, where_params: dict = None) -> int:
+    def update(
+        self, table: str, data: dict, where: str, where_params: dict = None, merge_columns: tuple[str, ...] = ()
+    ) -> int:
         """
         Update records in a table
 
@@ -184,6 +192,7 @@ class DataAPIClient:
             data: Dictionary of columns to update
             where: WHERE clause (without WHERE keyword)
             where_params: Parameters for WHERE clause
+            merge_columns: JSONB columns in data whose keys are merged into the stored value instead of replacing it
 
         Returns:
             Number of affected rows
@@ -191,7 +200,9 @@ class DataAPIClient:
         # Build SET clause with type casting where needed
         set_parts = []
         for col, val in data.items():
-            if isinstance(val, (dict, list)):
+            if col in merge_columns:
+                set_parts.append(f"{col} = COALESCE({col}, '{{}}'::jsonb) || :{col}::jsonb")
+            elif isinstance(val, (dict, list)):
                 set_parts.append(f"{col} = :{col}::jsonb")
             elif isinstance(val, Decimal):
                 set_parts.append(f"{col} = :{col}::numeric")
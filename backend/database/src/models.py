@@ -2,11 +2,13 @@
 Database models and query builders for CareerAssist
 """
 
+import json
 from datetime import datetime
 from typing import Any
 
 from .client import DataAPIClient
 from .schemas import (
+    AnswerEvaluation,
     CVVersionCreate,
     InterviewSessionCreate,
     JobApplicationCreate,
@@ -393,36 +395,47 @@ class InterviewSessions(BaseModel):
         return self.db.update(self.table_name, data, "id = :id::uuid", {"id": str(session_id)})
 
     def save_answer(self, session_id: str, question_id: str, answer: str) -> int:
-        """Save an answer to a question"""
-        # First get current answers
-        session = self.find_by_id(session_id)
-        answers = session.get("answers", []) if session else []
-
-        # Add or update the answer
-        answer_found = False
-        for ans in answers:
-            if ans.get("question_id") == question_id:
-                ans["answer"] = answer
-                ans["answered_at"] = datetime.utcnow().isoformat()
-                answer_found = True
-                break
-
-        if not answer_found:
-            answers.append({"question_id": question_id, "answer": answer, "answered_at": datetime.utcnow().isoformat()})
-
-        data = {"answers": answers}
-        return self.db.update(self.table_name, data, "id = :id::uuid", {"id": str(session_id)})
+        """Save an answer to a question, replacing any earlier answer to it in place"""
+        # Done in one UPDATE so the answer history is never read back or rewritten by the client
+        sql = f"""
+            UPDATE {self.table_name}
+            SET answers = CASE
+                WHEN COALESCE(answers, '[]'::jsonb) @> jsonb_build_array(jsonb_build_object('question_id', :question_id::text))
+                THEN (
+                    SELECT jsonb_agg(CASE WHEN a->>'question_id' = :question_id::text THEN :answer::jsonb ELSE a END ORDER BY i)
+                    FROM jsonb_array_elements(answers) WITH ORDINALITY AS t(a, i)
+                )
+                ELSE COALESCE(answers, '[]'::jsonb) || jsonb_build_array(:answer::jsonb)
+            END
+            WHERE id = :id::uuid
+        """
+        entry = {"question_id": question_id, "answer": answer, "answered_at": datetime.utcnow().isoformat()}
+        params = [
+            {"name": "question_id", "value": {"stringValue": question_id}},
+            {"name": "answer", "value": {"stringValue": json.dumps(entry)}},
+            {"name": "id", "value": {"stringValue": str(session_id)}},
+        ]
+        return self.db.execute(sql, params).get("numberOfRecordsUpdated", 0)
 
-    def save_evaluation(self, session_id: str, question_id: str, evaluation: dict) -> int:
+    def save_evaluation(self, session_id: str, question_id: str, evaluation: dict | AnswerEvaluation) -> int:
         """Save an evaluation for a question"""
-        session = self.find_by_id(session_id)
-        evaluations = session.get("evaluations", []) if session else []
-
-        evaluation["question_id"] = question_id
-        evaluations.append(evaluation)
-
-        data = {"evaluations": evaluations}
-        return self.db.update(self.table_name, data, "id = :id::uuid", {"id": str(session_id)})
+        # Append server-side with JSONB concatenation: one round-trip, constant-size payload
+        if isinstance(evaluation, AnswerEvaluation):
+            # Serialize the model directly rather than through an intermediate dict
+            evaluation_json = f"[{evaluation.model_copy(update={'question_id': question_id}).model_dump_json()}]"
+        else:
+            evaluation["question_id"] = question_id
+            evaluation_json = json.dumps([evaluation], default=str)
+        sql = f"""
+            UPDATE {self.table_name}
+            SET evaluations = COALESCE(evaluations, '[]'::jsonb) || :evaluation::jsonb
+            WHERE id = :id::uuid
+        """
+        params = [
+            {"name": "evaluation", "value": {"stringValue": evaluation_json}},
+            {"name": "id", "value": {"stringValue": str(session_id)}},
+        ]
+        return self.db.execute(sql, params).get("numberOfRecordsUpdated", 0)
 
     def complete_session(self, session_id: str, overall_score: int, duration_minutes: int) -> int:
         """Mark session as complete"""
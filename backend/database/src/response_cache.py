@@ -0,0 +1,64 @@
+"""
+In-process cache of agent responses, shared by the Lambda agents.
+
+Entries are keyed by a hash of a namespace (the agent or operation) and the
+canonical JSON of the request payload, so only an identical request (same CV,
+job posting, gap analysis, ...) is answered from the cache. The cache lives
+for the lifetime of the (warm) Lambda container, is bounded with LRU
+eviction and expires entries after a TTL.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+# Payload fields that identify the request rather than describe its content
+_EXCLUDED_FIELDS = frozenset({"job_id", "_trace_context"})
+
+
+class ResponseCache:
+    """Bounded, TTL-expiring cache of serialized agent responses."""
+
+    def __init__(self, ttl_seconds: float = 3600, max_entries: int = 128):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        # Lookups may come from worker threads
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(namespace: str, payload: dict[str, Any]) -> str:
+        """Hash a namespace and the content fields of its payload."""
+        content = {k: v for k, v in payload.items() if k not in _EXCLUDED_FIELDS}
+        canonical = json.dumps(content, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(f"{namespace}|{canonical}".encode()).hexdigest()
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """
+        Look up a cached response.
+
+        Returns:
+            A fresh copy of the stored response if present and unexpired, None otherwise
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            payload, created_at = entry
+            if time.monotonic() - created_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return json.loads(payload)
+
+    def put(self, key: str, response: dict[str, Any]) -> None:
+        """Store a response, evicting the least recently used entry when full."""
+        payload = json.dumps(response, default=str)
+        with self._lock:
+            self._entries[key] = (payload, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
@@ -14,6 +14,7 @@ This script verifies:
 import os
 
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from dotenv import load_dotenv
 
@@ -30,7 +31,12 @@ if not cluster_arn or not secret_arn:
     print("❌ Missing AURORA_CLUSTER_ARN or AURORA_SECRET_ARN in .env file")
     exit(1)
 
-client = boto3.client("rds-data", region_name=region)
+# Keep-alive pool reused by every statement instead of reconnecting after idle gaps
+client = boto3.client(
+    "rds-data",
+    region_name=region,
+    config=Config(max_pool_connections=10, retries={"mode": "standard", "max_attempts": 3}, tcp_keepalive=True),
+)
 
 
 def execute_query(sql, description):
@@ -33,8 +33,9 @@ def taint_and_deploy_via_terraform() -> bool:
         print(f"❌ Terraform directory not found: {terraform_dir}")
         return False
 
-    # Lambda function names to taint
-    lambda_functions = ["orchestrator", "extractor", "analyzer", "charter", "interviewer"]
+    # Lambda function names to taint. The extractor is updated in place: it publishes a new
+    # version that its "live" alias follows, and recreating it would delete the alias
+    lambda_functions = ["orchestrator", "analyzer", "charter", "interviewer"]
 
     print("📌 Step 1: Tainting Lambda functions to force recreation...")
     print("-" * 50)
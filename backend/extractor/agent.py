@@ -2,13 +2,18 @@
 CV/Job Extractor Agent - Parses CVs and job postings into structured data using OpenAI Agents SDK.
 """
 
+import asyncio
+import hashlib
+import json
 import logging
 import os
+import re
+from contextlib import nullcontext
 
-from agents import Agent, Runner, trace
+from agents import Agent, ModelBehaviorError, ModelSettings, Runner, set_tracing_disabled, trace
 from agents.agent_output import AgentOutputSchema
 from agents.extensions.models.litellm_model import LitellmModel
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, create_model
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -17,6 +22,21 @@ logger = logging.getLogger(__name__)
 BEDROCK_MODEL_ID = os.getenv("BEDROCK_MODEL_ID", "us.anthropic.claude-3-7-sonnet-20250219-v1:0")
 BEDROCK_REGION = os.getenv("BEDROCK_REGION", "us-west-2")
 
+# Extraction is structured parsing, so a smaller model handles most documents.
+# Long documents, or output that fails schema validation, escalate to BEDROCK_MODEL_ID.
+EXTRACTOR_MODEL_ID = os.getenv("EXTRACTOR_MODEL_ID", "us.anthropic.claude-3-5-haiku-20241022-v1:0")
+ESCALATION_CHAR_THRESHOLD = int(os.getenv("EXTRACTOR_ESCALATION_CHARS", "15000"))
+
+# Bedrock latency-optimized inference (only available for some models/regions)
+BEDROCK_LATENCY_OPTIMIZED = os.getenv("BEDROCK_LATENCY_OPTIMIZED", "false").lower() == "true"
+
+# Tracing can be switched off where nothing consumes the traces (e.g. non-prod)
+TRACING_DISABLED = os.getenv("DISABLE_TRACING", "false").lower() == "true"
+
+# Long CVs are split on section headers and the sections are extracted in parallel
+SECTION_SPLIT_MIN_CHARS = int(os.getenv("EXTRACTOR_SECTION_SPLIT_CHARS", "6000"))
+SECTION_CONCURRENCY = int(os.getenv("EXTRACTOR_SECTION_CONCURRENCY", "4"))
+
 
 # Import schemas from database package (added to extractor's src)
 # These are re-exported for convenience
@@ -112,87 +132,443 @@ except ImportError:
         company_description: str | None = Field(None, description="Company description if provided")
 
 
-from templates import CV_EXTRACTION_PROMPT, JOB_EXTRACTION_PROMPT
+from templates import (
+    COMBINED_EXTRACTION_PROMPT,
+    CV_EDUCATION_SECTION_PROMPT,
+    CV_EXPERIENCE_SECTION_PROMPT,
+    CV_EXTRACTION_PROMPT,
+    CV_PROFILE_SECTION_PROMPT,
+    CV_SKILLS_SECTION_PROMPT,
+    JOB_EXTRACTION_PROMPT,
+)
+
+# Resolve the trace context manager once; the no-op path skips SDK trace setup on every request
+if TRACING_DISABLED:
+    set_tracing_disabled(True)
+    _trace = nullcontext
+else:
+    _trace = trace
+
+# Set region for LiteLLM Bedrock calls (once, before the model is built)
+os.environ["AWS_REGION_NAME"] = BEDROCK_REGION
+
+# Models, output schemas and agents are built once per Lambda container and reused across warm invocations
+_MODEL = LitellmModel(model=f"bedrock/{EXTRACTOR_MODEL_ID}")
+_ESCALATION_MODEL = LitellmModel(model=f"bedrock/{BEDROCK_MODEL_ID}")
+_LATENCY_ARGS = {"performanceConfig": {"latency": "optimized"}} if BEDROCK_LATENCY_OPTIMIZED else {}
+_CV_OUTPUT = AgentOutputSchema(CVProfile, strict_json_schema=False)
+_JOB_OUTPUT = AgentOutputSchema(JobProfile, strict_json_schema=False)
+
+# Bedrock only caches prompt prefixes of at least this many tokens; a shorter
+# prefix marked for caching is silently a cache miss
+PROMPT_CACHE_MIN_TOKENS = int(os.getenv("PROMPT_CACHE_MIN_TOKENS", "1024"))
+
+
+def _estimate_prefix_tokens(instructions: str, output_type: AgentOutputSchema) -> int:
+    """Estimate the static prompt prefix (system prompt + output schema) at ~4 chars per token."""
+    return (len(instructions) + len(json.dumps(output_type.json_schema()))) // 4
+
+
+def _build_agent(name: str, instructions: str, model: LitellmModel, output_type: AgentOutputSchema) -> Agent:
+    """
+    Create an extractor agent with structured output.
+
+    The static prefix size is computed once here, at import, and prompt
+    caching is only requested for prefixes large enough to be cached.
+    """
+    extra_args = dict(_LATENCY_ARGS)
+    prefix_tokens = _estimate_prefix_tokens(instructions, output_type)
+    if prefix_tokens >= PROMPT_CACHE_MIN_TOKENS:
+        extra_args["cache_control_injection_points"] = [{"location": "message", "role": "system"}]
+    else:
+        logger.debug(f"{name}: ~{prefix_tokens} token prefix is below the prompt cache minimum, not caching")
+
+    return Agent(
+        name=name,
+        instructions=instructions,
+        model=model,
+        model_settings=ModelSettings(extra_args=extra_args or None),
+        output_type=output_type,
+    )
+
+
+_CV_AGENT = _build_agent("CV Extractor", CV_EXTRACTION_PROMPT, _MODEL, _CV_OUTPUT)
+_CV_ESCALATION_AGENT = _build_agent("CV Extractor", CV_EXTRACTION_PROMPT, _ESCALATION_MODEL, _CV_OUTPUT)
+_JOB_AGENT = _build_agent("Job Posting Extractor", JOB_EXTRACTION_PROMPT, _MODEL, _JOB_OUTPUT)
+_JOB_ESCALATION_AGENT = _build_agent("Job Posting Extractor", JOB_EXTRACTION_PROMPT, _ESCALATION_MODEL, _JOB_OUTPUT)
+
+
+class CombinedProfiles(BaseModel):
+    """CV and target job posting extracted in a single call"""
+
+    cv: CVProfile = Field(description="Structured data parsed from the CV")
+    job: JobProfile = Field(description="Structured data parsed from the job posting")
+
+
+_COMBINED_OUTPUT = AgentOutputSchema(CombinedProfiles, strict_json_schema=False)
+_COMBINED_AGENT = _build_agent("CV and Job Extractor", COMBINED_EXTRACTION_PROMPT, _MODEL, _COMBINED_OUTPUT)
+_COMBINED_ESCALATION_AGENT = _build_agent(
+    "CV and Job Extractor", COMBINED_EXTRACTION_PROMPT, _ESCALATION_MODEL, _COMBINED_OUTPUT
+)
+
+
+def _cv_section_schema(name: str, fields: tuple[str, ...]) -> type[BaseModel]:
+    """Build a partial CVProfile schema containing only the given fields."""
+    return create_model(
+        name, **{field: (CVProfile.model_fields[field].annotation, CVProfile.model_fields[field]) for field in fields}
+    )
+
+
+# Per-section agents with narrower schemas and prompts, used for long CVs
+_SECTION_AGENTS: dict[str, Agent] = {
+    "profile": _build_agent(
+        "CV Profile Extractor",
+        CV_PROFILE_SECTION_PROMPT,
+        _MODEL,
+        AgentOutputSchema(
+            _cv_section_schema(
+                "ProfileSection",
+                (
+                    "name",
+                    "email",
+                    "phone",
+                    "location",
+                    "linkedin_url",
+                    "github_url",
+                    "portfolio_url",
+                    "summary",
+                    "total_years_experience",
+                ),
+            ),
+            strict_json_schema=False,
+        ),
+    ),
+    "skills": _build_agent(
+        "CV Skills Extractor",
+        CV_SKILLS_SECTION_PROMPT,
+        _MODEL,
+        AgentOutputSchema(
+            _cv_section_schema("SkillsSection", ("skills", "certifications", "languages")), strict_json_schema=False
+        ),
+    ),
+    "experience": _build_agent(
+        "CV Experience Extractor",
+        CV_EXPERIENCE_SECTION_PROMPT,
+        _MODEL,
+        AgentOutputSchema(
+            _cv_section_schema("ExperienceSection", ("experience", "projects")), strict_json_schema=False
+        ),
+    ),
+    "education": _build_agent(
+        "CV Education Extractor",
+        CV_EDUCATION_SECTION_PROMPT,
+        _MODEL,
+        AgentOutputSchema(_cv_section_schema("EducationSection", ("education",)), strict_json_schema=False),
+    ),
+}
+
+_SECTION_KEYWORDS = {
+    "skills": ("SKILL", "TECHNOLOG", "CERTIFICATION", "LANGUAGE", "TOOLS"),
+    "experience": ("EXPERIENCE", "EMPLOYMENT", "WORK HISTORY", "PROJECT", "CAREER"),
+    "education": ("EDUCATION", "ACADEMIC", "QUALIFICATION"),
+}
+
+SECTION_HEADER_RE = re.compile(r"^[A-Z][A-Z &/]{3,}:?$")
+
+# Deterministic fields are parsed with regex instead of being paid for as LLM output tokens
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+PHONE_RE = re.compile(r"(?:\+?\d{1,3}[\s.-]?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}\b")
+LINKEDIN_RE = re.compile(r"(?:https?://)?(?:www\.)?linkedin\.com/in/[\w-]+/?", re.IGNORECASE)
+GITHUB_RE = re.compile(r"(?:https?://)?(?:www\.)?github\.com/[\w-]+/?", re.IGNORECASE)
+SALARY_RE = re.compile(r"\$\s?(\d{2,3})(?:,?(\d{3})|[kK])\s*(?:-|–|to)\s*\$?\s?(\d{2,3})(?:,?(\d{3})|[kK])")
+
+# Cheap sniff tests that reject text which is clearly not a CV/job posting before any LLM call
+MIN_TEXT_CHARS = 200
+MIN_PRINTABLE_RATIO = 0.9
+CV_HEADER_RE = re.compile(r"^[ \t]*[A-Z][A-Za-z &/]{3,}:?[ \t]*$", re.MULTILINE)
+JOB_KEYWORD_RE = re.compile(r"experience|years|required|requirements|responsibilities", re.IGNORECASE)
+
+
+def _split_cv_sections(raw_text: str) -> dict[str, str] | None:
+    """
+    Split CV text into labelled sections on uppercase header lines.
+
+    Text before the first header and unrecognised sections (e.g. SUMMARY)
+    go to the "profile" section.
+
+    Returns:
+        Mapping of section name to text, or None if fewer than 2 headers were found
+    """
+    sections: dict[str, list[str]] = {"profile": []}
+    current = "profile"
+    headers = 0
+
+    for line in raw_text.splitlines():
+        stripped = line.strip()
+        if SECTION_HEADER_RE.match(stripped):
+            headers += 1
+            current = next(
+                (name for name, keywords in _SECTION_KEYWORDS.items() if any(k in stripped for k in keywords)),
+                "profile",
+            )
+        sections.setdefault(current, []).append(line)
+
+    if headers < 2:
+        return None
+    return {name: "\n".join(lines) for name, lines in sections.items() if any(line.strip() for line in lines)}
+
+
+def _regex_prefill(raw_text: str, kind: str) -> dict:
+    """
+    Pre-extract fields that are deterministically parseable.
+
+    Args:
+        raw_text: Raw CV or job posting text
+        kind: "cv" or "job"
+
+    Returns:
+        Dictionary of CVProfile/JobProfile field values that were found
+    """
+    prefill = {}
+    if kind == "cv":
+        for field, pattern in (
+            ("email", EMAIL_RE),
+            ("phone", PHONE_RE),
+            ("linkedin_url", LINKEDIN_RE),
+            ("github_url", GITHUB_RE),
+        ):
+            match = pattern.search(raw_text)
+            if match:
+                prefill[field] = match.group(0).strip().rstrip(".")
+    else:
+        match = SALARY_RE.search(raw_text)
+        if match:
+            low_k, low_rest, high_k, high_rest = match.groups()
+            prefill["salary_min"] = int(low_k) * 1000 + int(low_rest or 0)
+            prefill["salary_max"] = int(high_k) * 1000 + int(high_rest or 0)
+    return prefill
+
+
+def _with_prefill_hint(text: str, prefill: dict) -> str:
+    """Prefix text with a 'Pre-extracted:' line telling the model which fields it can skip."""
+    if not prefill:
+        return text
+    hints = ", ".join(f"{field}={value}" for field, value in prefill.items())
+    return f"Pre-extracted: {hints}\n\n{text}"
+
+
+def reject_reason(raw_text: str, kind: str) -> str | None:
+    """
+    Check whether text is trivially not worth sending to the model.
+
+    Args:
+        raw_text: Raw CV or job posting text
+        kind: "cv" or "job"
+
+    Returns:
+        Error message if the text should be rejected, None otherwise
+    """
+    stripped = (raw_text or "").strip()
+    if len(stripped) < MIN_TEXT_CHARS:
+        return "text too short"
+    # Newlines and tabs are not printable but are normal in documents
+    printable = sum(c.isprintable() or c in "\n\r\t" for c in stripped)
+    if printable / len(stripped) < MIN_PRINTABLE_RATIO:
+        return "text looks like binary data"
+    if kind == "cv":
+        if not (EMAIL_RE.search(stripped) or PHONE_RE.search(stripped) or CV_HEADER_RE.search(stripped)):
+            return "text does not look like a CV"
+    elif not JOB_KEYWORD_RE.search(stripped):
+        return "text does not look like a job posting"
+    return None
+
+
+async def _extract_cv_sections(sections: dict[str, str]) -> CVProfile:
+    """Extract each CV section in parallel and merge the partial results into one CVProfile."""
+    semaphore = asyncio.Semaphore(SECTION_CONCURRENCY)
+
+    async def run_section(name: str, text: str) -> dict:
+        async with semaphore:
+            result = await _run_streamed(_SECTION_AGENTS[name], text)
+        return result.final_output.model_dump(exclude_unset=True)
+
+    partials = await asyncio.gather(*(run_section(name, text) for name, text in sections.items()))
+
+    merged: dict = {}
+    for partial in partials:
+        merged.update(partial)
+    return CVProfile.model_validate(merged)
+
+
+async def _run_streamed(agent: Agent, task: str):
+    """
+    Run an agent in streaming mode and drain its events.
+
+    Streaming lets the response be consumed as Bedrock decodes it instead of
+    blocking on one final payload; the structured output is available on the
+    returned result once the stream is exhausted.
+    """
+    result = Runner.run_streamed(agent, input=task)
+    first_token_logged = False
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    async for event in result.stream_events():
+        if not first_token_logged and event.type == "raw_response_event":
+            logger.info(f"{agent.name}: first token after {loop.time() - started:.2f}s")
+            first_token_logged = True
+    return result
+
+
+async def _run_routed(agent: Agent, escalation_agent: Agent, raw_text: str):
+    """
+    Run the small-model agent, escalating to the larger model when needed.
+
+    Documents longer than ESCALATION_CHAR_THRESHOLD go straight to the larger
+    model; otherwise the small model is tried first and its output is retried
+    on the larger model if it fails schema validation.
+
+    The raw text is sent as the whole user message; the fixed instructions
+    live in the agent's system prompt so they stay in the cacheable prefix.
+    """
+    if len(raw_text) > ESCALATION_CHAR_THRESHOLD:
+        logger.info(f"{agent.name}: {len(raw_text)} chars exceeds threshold, using {BEDROCK_MODEL_ID}")
+        return await _run_streamed(escalation_agent, raw_text)
+
+    try:
+        return await _run_streamed(agent, raw_text)
+    except ModelBehaviorError as e:
+        logger.warning(f"{agent.name}: invalid output from {EXTRACTOR_MODEL_ID}, escalating to {BEDROCK_MODEL_ID}: {e}")
+        return await _run_streamed(escalation_agent, raw_text)
+
+
+# In-flight extractions keyed by kind + text hash, shared by concurrent identical requests
+_INFLIGHT: dict[str, asyncio.Future] = {}
+
+
+async def _singleflight(kind: str, raw_text: str, extract):
+    """
+    Run an extraction once for concurrent callers with the same text.
+
+    The first caller runs extract(raw_text); callers arriving while it is in
+    flight await the same future and share its result (or exception).
+    """
+    key = f"{kind}:{hashlib.sha256(raw_text.encode()).hexdigest()}"
+    if key in _INFLIGHT:
+        logger.info(f"Joining in-flight {kind} extraction")
+        return await asyncio.shield(_INFLIGHT[key])
+
+    future = asyncio.get_running_loop().create_future()
+    _INFLIGHT[key] = future
+    try:
+        result = await extract(raw_text)
+        future.set_result(result)
+        return result
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        # Mark the exception as retrieved when nobody else was waiting on it
+        future.exception()
+        raise
+    finally:
+        _INFLIGHT.pop(key, None)
 
 
 async def extract_cv(raw_text: str) -> CVProfile:
     """
     Extract structured data from CV text using LLM.
 
+    Concurrent calls with identical text share a single extraction.
+
     Args:
         raw_text: Raw CV text content
 
     Returns:
         Structured CVProfile with parsed information
     """
-    # Set region for LiteLLM Bedrock calls
-    os.environ["AWS_REGION_NAME"] = BEDROCK_REGION
-
-    model = LitellmModel(model=f"bedrock/{BEDROCK_MODEL_ID}")
+    return await _singleflight("cv", raw_text, _extract_cv)
 
-    # Create agent with structured output
-    agent = Agent(
-        name="CV Extractor",
-        instructions=CV_EXTRACTION_PROMPT,
-        model=model,
-        output_type=AgentOutputSchema(CVProfile, strict_json_schema=False),
-    )
-
-    task = f"""Extract all information from this CV/resume text:
 
----
-{raw_text}
----
+async def _extract_cv(raw_text: str) -> CVProfile:
+    """Extract a CV without request coalescing."""
+    prefill = _regex_prefill(raw_text, "cv")
+    sections = _split_cv_sections(raw_text) if len(raw_text) >= SECTION_SPLIT_MIN_CHARS else None
 
-Parse the CV carefully and extract all relevant information into the structured format."""
+    with _trace("CV Extraction"):
+        if sections and "profile" in sections:
+            try:
+                sections["profile"] = _with_prefill_hint(sections["profile"], prefill)
+                profile = (await _extract_cv_sections(sections)).model_copy(update=prefill)
+                logger.info(f"CV extraction completed for: {profile.name} ({len(sections)} sections in parallel)")
+                return profile
+            except Exception as e:
+                logger.warning(f"Section extraction failed, falling back to single pass: {e}")
 
-    with trace("CV Extraction"):
-        result = await Runner.run(agent, input=task)
+        result = await _run_routed(_CV_AGENT, _CV_ESCALATION_AGENT, _with_prefill_hint(raw_text, prefill))
 
-    logger.info(
-        f"CV extraction completed for: {result.final_output.name if hasattr(result.final_output, 'name') else 'Unknown'}"
-    )
-    return result.final_output
+    profile = result.final_output.model_copy(update=prefill)
+    logger.info(f"CV extraction completed for: {getattr(profile, 'name', 'Unknown')}")
+    return profile
 
 
 async def extract_job_posting(raw_text: str) -> JobProfile:
     """
     Extract structured data from job posting text using LLM.
 
+    Concurrent calls with identical text share a single extraction.
+
     Args:
         raw_text: Raw job posting text
 
     Returns:
         Structured JobProfile with parsed information
     """
-    # Set region for LiteLLM Bedrock calls
-    os.environ["AWS_REGION_NAME"] = BEDROCK_REGION
+    return await _singleflight("job", raw_text, _extract_job_posting)
 
-    model = LitellmModel(model=f"bedrock/{BEDROCK_MODEL_ID}")
 
-    # Create agent with structured output
-    agent = Agent(
-        name="Job Posting Extractor",
-        instructions=JOB_EXTRACTION_PROMPT,
-        model=model,
-        output_type=AgentOutputSchema(JobProfile, strict_json_schema=False),
+async def _extract_job_posting(raw_text: str) -> JobProfile:
+    """Extract a job posting without request coalescing."""
+    prefill = _regex_prefill(raw_text, "job")
+
+    with _trace("Job Posting Extraction"):
+        result = await _run_routed(_JOB_AGENT, _JOB_ESCALATION_AGENT, _with_prefill_hint(raw_text, prefill))
+
+    output = result.final_output.model_copy(update=prefill)
+    logger.info(
+        f"Job extraction completed for: {getattr(output, 'role_title', 'Unknown')} at {getattr(output, 'company', 'Unknown')}"
     )
+    return output
 
-    task = f"""Extract all information from this job posting:
 
----
-{raw_text}
----
+async def extract_combined(cv_text: str, job_text: str) -> tuple[CVProfile, JobProfile]:
+    """
+    Extract a CV and a target job posting in one LLM call.
 
-Parse the job posting carefully and extract all relevant requirements and information into the structured format."""
+    Saves a full Bedrock round-trip (and second time-to-first-token) for the
+    common CV + job matching batch.
 
-    with trace("Job Posting Extraction"):
-        result = await Runner.run(agent, input=task)
+    Args:
+        cv_text: Raw CV text content
+        job_text: Raw job posting text
 
-    logger.info(
-        f"Job extraction completed for: {result.final_output.role_title if hasattr(result.final_output, 'role_title') else 'Unknown'} at {result.final_output.company if hasattr(result.final_output, 'company') else 'Unknown'}"
+    Returns:
+        Tuple of (CVProfile, JobProfile)
+    """
+    cv_prefill = _regex_prefill(cv_text, "cv")
+    job_prefill = _regex_prefill(job_text, "job")
+    combined_text = (
+        f"=== CV ===\n{_with_prefill_hint(cv_text, cv_prefill)}\n\n"
+        f"=== JOB POSTING ===\n{_with_prefill_hint(job_text, job_prefill)}"
     )
-    return result.final_output
+
+    with _trace("Combined Extraction"):
+        result = await _run_routed(_COMBINED_AGENT, _COMBINED_ESCALATION_AGENT, combined_text)
+
+    cv_profile = result.final_output.cv.model_copy(update=cv_prefill)
+    job_profile = result.final_output.job.model_copy(update=job_prefill)
+    logger.info(f"Combined extraction completed for: {cv_profile.name} / {job_profile.role_title}")
+    return cv_profile, job_profile
 
 
 def cv_profile_to_dict(profile: CVProfile) -> dict:
@@ -203,3 +579,13 @@ def cv_profile_to_dict(profile: CVProfile) -> dict:
 def job_profile_to_dict(profile: JobProfile) -> dict:
     """Convert JobProfile to dictionary for database storage."""
     return profile.model_dump()
+
+
+def cv_profile_to_json(profile: CVProfile) -> str:
+    """Serialize CVProfile straight to JSON for database storage, skipping the intermediate dict."""
+    return profile.model_dump_json()
+
+
+def job_profile_to_json(profile: JobProfile) -> str:
+    """Serialize JobProfile straight to JSON for database storage, skipping the intermediate dict."""
+    return profile.model_dump_json()
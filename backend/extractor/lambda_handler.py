@@ -6,6 +6,7 @@ Parses CVs and job postings into structured data.
 import asyncio
 import json
 import logging
+from contextlib import nullcontext
 from typing import Any
 
 try:
@@ -15,7 +16,27 @@ try:
 except ImportError:
     pass
 
-from agent import cv_profile_to_dict, extract_cv, extract_job_posting, job_profile_to_dict
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> str:
+        """Serialize a response body with orjson."""
+        return orjson.dumps(obj).decode()
+
+except ImportError:
+    _dumps = json.dumps
+
+from agent import (
+    TRACING_DISABLED,
+    cv_profile_to_dict,
+    cv_profile_to_json,
+    extract_combined,
+    extract_cv,
+    extract_job_posting,
+    job_profile_to_dict,
+    job_profile_to_json,
+    reject_reason,
+)
 from observability import extract_trace_context, observe
 from src import Database
 
@@ -26,6 +47,48 @@ logger.setLevel(logging.INFO)
 # Initialize database
 db = Database()
 
+# Langfuse observation is skipped entirely when tracing is disabled
+_observe = (lambda **kwargs: nullcontext()) if TRACING_DISABLED else observe
+
+
+async def save_cv_profile(profile, cv_version_id: str) -> None:
+    """Store a parsed CV profile on its cv_versions row."""
+    try:
+        # Run the blocking Data API call off the event loop
+        await asyncio.to_thread(
+            db.client.update,
+            "cv_versions",
+            {"parsed_json": cv_profile_to_json(profile)},
+            "id = :id",
+            {"id": cv_version_id},
+        )
+        logger.info(f"Updated CV version {cv_version_id} with parsed data")
+    except Exception as e:
+        logger.warning(f"Could not update database: {e}")
+
+
+async def save_job_profile(profile, profile_dict: dict, job_posting_id: str) -> None:
+    """Store a parsed job profile and its summary columns on its job_postings row."""
+    try:
+        # Prepare update data
+        update_data = {
+            "parsed_json": job_profile_to_json(profile),
+            "company_name": profile_dict.get("company"),
+            "role_title": profile_dict.get("role_title"),
+            "location": profile_dict.get("location"),
+            "remote_policy": profile_dict.get("remote_policy"),
+        }
+        # Add salary if present
+        if profile_dict.get("salary_min"):
+            update_data["salary_min"] = profile_dict["salary_min"]
+        if profile_dict.get("salary_max"):
+            update_data["salary_max"] = profile_dict["salary_max"]
+
+        await asyncio.to_thread(db.client.update, "job_postings", update_data, "id = :id", {"id": job_posting_id})
+        logger.info(f"Updated job posting {job_posting_id} with parsed data")
+    except Exception as e:
+        logger.warning(f"Could not update database: {e}")
+
 
 async def process_cv_extraction(cv_text: str, user_id: str = None, cv_version_id: str = None) -> dict[str, Any]:
     """
@@ -42,19 +105,19 @@ async def process_cv_extraction(cv_text: str, user_id: str = None, cv_version_id
     try:
         logger.info(f"Processing CV extraction, text length: {len(cv_text)}")
 
+        # Reject garbage before paying for an LLM round-trip
+        reason = reject_reason(cv_text, "cv")
+        if reason:
+            logger.warning(f"Rejected CV text: {reason}")
+            return {"success": False, "type": "cv", "error": reason}
+
         # Extract CV data
         profile = await extract_cv(cv_text)
         profile_dict = cv_profile_to_dict(profile)
 
         # Update database if cv_version_id provided
         if cv_version_id:
-            try:
-                get_db().client.update(
-                    "cv_versions", {"parsed_json": json.dumps(profile_dict)}, "id = :id", {"id": cv_version_id}
-                )
-                logger.info(f"Updated CV version {cv_version_id} with parsed data")
-            except Exception as e:
-                logger.warning(f"Could not update database: {e}")
+            await save_cv_profile(profile, cv_version_id)
 
         return {"success": True, "type": "cv", "profile": profile_dict, "cv_version_id": cv_version_id}
 
@@ -78,31 +141,19 @@ async def process_job_extraction(job_text: str, user_id: str = None, job_posting
     try:
         logger.info(f"Processing job extraction, text length: {len(job_text)}")
 
+        # Reject garbage before paying for an LLM round-trip
+        reason = reject_reason(job_text, "job")
+        if reason:
+            logger.warning(f"Rejected job text: {reason}")
+            return {"success": False, "type": "job", "error": reason}
+
         # Extract job data
         profile = await extract_job_posting(job_text)
         profile_dict = job_profile_to_dict(profile)
 
         # Update database if job_posting_id provided
         if job_posting_id:
-            try:
-                # Prepare update data
-                update_data = {
-                    "parsed_json": json.dumps(profile_dict),
-                    "company_name": profile_dict.get("company"),
-                    "role_title": profile_dict.get("role_title"),
-                    "location": profile_dict.get("location"),
-                    "remote_policy": profile_dict.get("remote_policy"),
-                }
-                # Add salary if present
-                if profile_dict.get("salary_min"):
-                    update_data["salary_min"] = profile_dict["salary_min"]
-                if profile_dict.get("salary_max"):
-                    update_data["salary_max"] = profile_dict["salary_max"]
-
-                get_db().client.update("job_postings", update_data, "id = :id", {"id": job_posting_id})
-                logger.info(f"Updated job posting {job_posting_id} with parsed data")
-            except Exception as e:
-                logger.warning(f"Could not update database: {e}")
+            await save_job_profile(profile, profile_dict, job_posting_id)
 
         return {"success": True, "type": "job", "profile": profile_dict, "job_posting_id": job_posting_id}
 
@@ -111,6 +162,109 @@ async def process_job_extraction(job_text: str, user_id: str = None, job_posting
         return {"success": False, "type": "job", "error": str(e)}
 
 
+async def _process_separately(cv_item: dict, job_item: dict) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Run the single-item CV and job processors concurrently."""
+    return tuple(
+        await asyncio.gather(
+            process_cv_extraction(cv_item["text"], cv_item.get("user_id"), cv_item.get("cv_version_id")),
+            process_job_extraction(job_item["text"], job_item.get("user_id"), job_item.get("job_posting_id")),
+        )
+    )
+
+
+async def process_combined_extraction(cv_item: dict, job_item: dict) -> tuple[dict[str, Any], dict[str, Any]]:
+    """
+    Extract a CV and job posting from the same batch in a single LLM call.
+
+    Args:
+        cv_item: Batch item with type "cv"
+        job_item: Batch item with type "job"
+
+    Returns:
+        Tuple of (CV result, job result) in the same shape as the single-item processors
+    """
+    cv_version_id = cv_item.get("cv_version_id")
+    job_posting_id = job_item.get("job_posting_id")
+    cv_reason = reject_reason(cv_item["text"], "cv")
+    job_reason = reject_reason(job_item["text"], "job")
+    if cv_reason or job_reason:
+        # Fall back to the single-item processors, which reject the bad text without an LLM call
+        return await _process_separately(cv_item, job_item)
+    try:
+        logger.info(f"Processing combined extraction, text lengths: {len(cv_item['text'])}/{len(job_item['text'])}")
+
+        cv_profile, job_profile = await extract_combined(cv_item["text"], job_item["text"])
+        cv_dict = cv_profile_to_dict(cv_profile)
+        job_dict = job_profile_to_dict(job_profile)
+
+        saves = []
+        if cv_version_id:
+            saves.append(save_cv_profile(cv_profile, cv_version_id))
+        if job_posting_id:
+            saves.append(save_job_profile(job_profile, job_dict, job_posting_id))
+        await asyncio.gather(*saves)
+
+        return (
+            {"success": True, "type": "cv", "profile": cv_dict, "cv_version_id": cv_version_id},
+            {"success": True, "type": "job", "profile": job_dict, "job_posting_id": job_posting_id},
+        )
+
+    except Exception as e:
+        # One bad half should not fail both items; extract each on its own instead
+        logger.warning(f"Combined extraction error, extracting separately: {e}", exc_info=True)
+        return await _process_separately(cv_item, job_item)
+
+
+def _find_cv_job_pair(batch: list[dict]) -> tuple[int, int] | None:
+    """Return indexes of the first CV and job posting in a batch that share a user_id, if any."""
+    for cv_idx, cv_item in enumerate(batch):
+        user_id = cv_item.get("user_id")
+        # Items without a user_id cannot be tied to each other
+        if cv_item.get("type") != "cv" or user_id is None:
+            continue
+        for job_idx, job_item in enumerate(batch):
+            if job_item.get("type") == "job" and job_item.get("user_id") == user_id:
+                return cv_idx, job_idx
+    return None
+
+
+async def process_batch(batch: list[dict]) -> list[dict[str, Any]]:
+    """
+    Process a batch of extraction items on one event loop.
+
+    Items run concurrently so duplicate texts in the batch share a single
+    in-flight extraction.
+
+    Returns:
+        Results in the same order as the batch
+    """
+    results: list[dict[str, Any] | None] = [None] * len(batch)
+    tasks = {}
+
+    # A CV + target job for the same user is extracted in one LLM call
+    pair = _find_cv_job_pair(batch)
+    if pair:
+        cv_idx, job_idx = pair
+        tasks[pair] = process_combined_extraction(batch[cv_idx], batch[job_idx])
+
+    for i, item in enumerate(batch):
+        if pair and i in pair:
+            continue
+        if item.get("type") == "cv":
+            tasks[i] = process_cv_extraction(item["text"], item.get("user_id"), item.get("cv_version_id"))
+        elif item.get("type") == "job":
+            tasks[i] = process_job_extraction(item["text"], item.get("user_id"), item.get("job_posting_id"))
+        else:
+            results[i] = {"success": False, "error": 'Invalid type, must be "cv" or "job"'}
+
+    for key, result in zip(tasks, await asyncio.gather(*tasks.values()), strict=True):
+        if key == pair:
+            results[pair[0]], results[pair[1]] = result
+        else:
+            results[key] = result
+    return results
+
+
 def lambda_handler(event, context):
     """
     Lambda handler for CV and job posting extraction.
@@ -140,7 +294,7 @@ def lambda_handler(event, context):
 
     logger.info(f"🚀 Extractor Lambda invoked: type={extraction_type}, job={job_id}")
 
-    with observe(
+    with _observe(
         job_id=job_id,
         agent_name="career-extractor",
         trace_id=trace_ctx.get("trace_id"),
@@ -152,21 +306,8 @@ def lambda_handler(event, context):
 
             # Handle batch processing
             if "batch" in event:
-                results = []
-                for item in event["batch"]:
-                    if item.get("type") == "cv":
-                        result = asyncio.run(
-                            process_cv_extraction(item["text"], item.get("user_id"), item.get("cv_version_id"))
-                        )
-                    elif item.get("type") == "job":
-                        result = asyncio.run(
-                            process_job_extraction(item["text"], item.get("user_id"), item.get("job_posting_id"))
-                        )
-                    else:
-                        result = {"success": False, "error": 'Invalid type, must be "cv" or "job"'}
-                    results.append(result)
-
-                return {"statusCode": 200, "body": json.dumps({"results": results})}
+                results = asyncio.run(process_batch(event["batch"]))
+                return {"statusCode": 200, "body": _dumps({"results": results})}
 
             # Handle single extraction
             extraction_type = event.get("type")
@@ -183,7 +324,7 @@ def lambda_handler(event, context):
                 return {"statusCode": 400, "body": json.dumps({"error": 'Invalid type, must be "cv" or "job"'})}
 
             status_code = 200 if result.get("success") else 500
-            return {"statusCode": status_code, "body": json.dumps(result)}
+            return {"statusCode": status_code, "body": _dumps(result)}
 
         except Exception as e:
             logger.error(f"Lambda handler error: {e}", exc_info=True)
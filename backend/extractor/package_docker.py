@@ -113,15 +113,23 @@ def deploy_lambda(zip_path):
 
     lambda_client = boto3.client("lambda")
     function_name = "career-extractor"
+    alias_name = "live"
 
     print(f"Deploying to Lambda function: {function_name}")
 
     try:
-        # Try to update existing function
+        # Try to update existing function, publishing a new SnapStart version
         with open(zip_path, "rb") as f:
-            response = lambda_client.update_function_code(FunctionName=function_name, ZipFile=f.read())
-        print(f"Successfully updated Lambda function: {function_name}")
+            response = lambda_client.update_function_code(FunctionName=function_name, ZipFile=f.read(), Publish=True)
+        version = response["Version"]
+        print(f"Successfully updated Lambda function: {function_name} (version {version})")
         print(f"Function ARN: {response['FunctionArn']}")
+
+        # Wait for the SnapStart snapshot before pointing the alias at the new version
+        print("Waiting for SnapStart snapshot...")
+        lambda_client.get_waiter("published_version_active").wait(FunctionName=function_name, Qualifier=version)
+        lambda_client.update_alias(FunctionName=function_name, Name=alias_name, FunctionVersion=version)
+        print(f"Alias '{alias_name}' now points to version {version}")
     except lambda_client.exceptions.ResourceNotFoundException:
         print(f"Lambda function {function_name} not found. Please deploy via Terraform first.")
         sys.exit(1)
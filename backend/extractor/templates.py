@@ -2,7 +2,7 @@
 Instruction templates for the CV/Job Extractor Agent.
 """
 
-CV_EXTRACTION_PROMPT = """You are an expert CV/Resume parser. Your task is to extract structured information from CV text.
+CV_EXTRACTION_GUIDELINES = """You are an expert CV/Resume parser. Your task is to extract structured information from CV text.
 
 EXTRACTION GUIDELINES:
 
@@ -50,7 +50,16 @@ IMPORTANT RULES:
 - Preserve the original wording in highlights for authenticity
 - ATS-friendly: capture all keywords that might be important for job matching"""
 
-JOB_EXTRACTION_PROMPT = """You are an expert job posting parser. Your task is to extract structured requirements and information from job postings.
+CV_EXTRACTION_PROMPT = (
+    CV_EXTRACTION_GUIDELINES
+    + """
+
+The user message contains the raw CV/resume text, optionally preceded by a "Pre-extracted:" line.
+Fields listed on that line were parsed deterministically and are filled in automatically - return null for them.
+Parse the CV carefully and extract all relevant information into the structured format."""
+)
+
+JOB_EXTRACTION_GUIDELINES = """You are an expert job posting parser. Your task is to extract structured requirements and information from job postings.
 
 EXTRACTION GUIDELINES:
 
@@ -96,3 +105,70 @@ IMPORTANT RULES:
 - Extract EVERY technology, tool, and skill mentioned
 - Be precise with seniority inference based on experience requirements
 - Capture the full context of each requirement for better matching"""
+
+JOB_EXTRACTION_PROMPT = (
+    JOB_EXTRACTION_GUIDELINES
+    + """
+
+The user message contains the raw job posting text, optionally preceded by a "Pre-extracted:" line.
+Fields listed on that line were parsed deterministically and are filled in automatically - return null for them.
+Parse the job posting carefully and extract all relevant requirements and information into the structured format."""
+)
+
+# Prompt for extracting a CV and a target job posting in a single call
+COMBINED_EXTRACTION_PROMPT = f"""You parse a CV and a target job posting in one pass and return both as `cv` and `job`.
+
+The user message contains the CV after a "=== CV ===" line and the job posting after a "=== JOB POSTING ===" line.
+Either part may start with a "Pre-extracted:" line; fields listed there are filled in automatically - return null for them.
+
+# CV
+
+{CV_EXTRACTION_GUIDELINES}
+
+# JOB POSTING
+
+{JOB_EXTRACTION_GUIDELINES}"""
+
+# Narrower prompts for section-by-section extraction of long CVs.
+# Each section is parsed independently and merged into one CVProfile.
+
+CV_PROFILE_SECTION_PROMPT = """You are an expert CV/Resume parser. The user message is the header and summary portion of a CV.
+
+Extract:
+- Full name, email, phone, location
+- LinkedIn, GitHub and portfolio URLs
+- The professional summary or objective (infer a short one if none is stated)
+- total_years_experience if it is stated or clearly implied
+
+Only use information present in the given text.
+Fields listed on a leading "Pre-extracted:" line are filled in automatically - return null for them."""
+
+CV_SKILLS_SECTION_PROMPT = """You are an expert CV/Resume parser. The user message is the skills, certifications and languages sections of a CV.
+
+Extract:
+- Every technical and soft skill listed
+- Proficiency: "expert", "proficient", "familiar" or "learning", inferred from any stated level or emphasis
+- Category: technical, soft_skill, tool, certification, language, domain
+- All professional certifications
+- All languages spoken
+
+Be thorough - don't miss any skill or keyword."""
+
+CV_EXPERIENCE_SECTION_PROMPT = """You are an expert CV/Resume parser. The user message is the work experience and projects sections of a CV.
+
+Extract:
+- All work experience entries in chronological order
+- Company name, job title, dates (YYYY-MM format preferred), location
+- Key achievements as highlights, preserving the original wording
+- Technologies used in each role
+- Mark the current job with is_current=true
+- Notable personal or professional projects, if listed
+
+Be thorough - don't miss any role or achievement."""
+
+CV_EDUCATION_SECTION_PROMPT = """You are an expert CV/Resume parser. The user message is the education section of a CV.
+
+Extract:
+- All education entries
+- Institution, degree type, field of study
+- Graduation date, GPA and honors if available"""
@@ -3,19 +3,30 @@
 Simple test for Extractor agent - CV and Job Parsing
 """
 
+import functools
 import json
+import os
+import sys
 
-from dotenv import load_dotenv
 
-load_dotenv(override=True)
+@functools.cache
+def _lambda_handler():
+    """
+    Import the Lambda handler on first use.
 
-import os
-import sys
+    Loading .env and importing the handler (which pulls in the agent, boto3 and
+    the database client) is deferred so collecting these tests stays cheap.
+    """
+    from dotenv import load_dotenv
+
+    load_dotenv(override=True)
+
+    # Add database directory to path so 'src' module can be found
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../database")))
 
-# Add database directory to path so 'src' module can be found
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../database")))
+    from lambda_handler import lambda_handler
 
-from lambda_handler import lambda_handler
+    return lambda_handler
 
 
 def test_extractor_cv():
@@ -53,7 +64,7 @@ def test_extractor_cv():
     print("Testing Extractor Agent - CV Parsing...")
     print("=" * 60)
 
-    result = lambda_handler(test_event, None)
+    result = _lambda_handler()(test_event, None)
 
     print(f"Status Code: {result['statusCode']}")
 
@@ -113,7 +124,7 @@ def test_extractor_job():
     print("\nTesting Extractor Agent - Job Parsing...")
     print("=" * 60)
 
-    result = lambda_handler(test_event, None)
+    result = _lambda_handler()(test_event, None)
 
     print(f"Status Code: {result['statusCode']}")
 
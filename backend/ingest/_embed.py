@@ -0,0 +1,101 @@
+"""
+Shared helpers for the ingest scripts: AWS client settings, SageMaker embeddings and vector IDs.
+"""
+
+import io
+import json
+import os
+import uuid
+
+import numpy as np
+
+# Ask the endpoint for a binary .npy response instead of JSON. The HuggingFace inference
+# toolkit encodes application/x-npy natively, but only for rectangular outputs, so this
+# should only be enabled for models that return pooled sentence embeddings.
+NPY_OUTPUT = os.getenv("EMBEDDING_NPY_OUTPUT", "false").lower() == "true"
+
+
+def make_client(service_name: str):
+    """
+    Create a boto3 client with the shared ingest connection settings.
+
+    Larger connection pool, keepalive and adaptive retries for the batched and
+    parallel ingest paths. boto3 is imported here so that importing the
+    scripts (e.g. from a test runner) stays cheap.
+    """
+    import boto3
+    from botocore.config import Config
+
+    config = Config(max_pool_connections=64, retries={"max_attempts": 5, "mode": "adaptive"}, tcp_keepalive=True)
+    return boto3.client(service_name, config=config)
+
+
+def new_vector_ids(count: int) -> list[str]:
+    """Generate count random UUID4 strings from a single os.urandom call."""
+    raw = os.urandom(16 * count)
+    return [str(uuid.UUID(bytes=raw[i : i + 16], version=4)) for i in range(0, 16 * count, 16)]
+
+
+def parse_embeddings(result) -> np.ndarray:
+    """
+    Convert a HuggingFace feature-extraction response into a (batch, dim) float32 array.
+
+    The endpoint nests each input's embedding as [[embedding]] (or returns
+    token-level vectors); the first vector of each input is kept.
+    """
+    try:
+        arr = np.asarray(result, dtype=np.float32)
+    except ValueError:
+        # Token-level outputs have a different length per input
+        return np.stack([parse_embeddings(item)[0] for item in result])
+    if arr.ndim == 1:
+        return arr.reshape(1, -1)
+    if arr.ndim > 2:
+        arr = arr.reshape(arr.shape[0], -1, arr.shape[-1])[:, 0]
+    return arr
+
+
+def normalize(embeddings: np.ndarray) -> np.ndarray:
+    """
+    Scale embeddings to unit length along the last axis.
+
+    Unit vectors make cosine distance equal to 1 - dot product, so the index
+    and clients never have to re-normalize them.
+    """
+    return embeddings / (np.linalg.norm(embeddings, axis=-1, keepdims=True) + 1e-12)
+
+
+def quantize_int8(embeddings: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Quantize (batch, dim) embeddings to int8 with one scale per vector.
+
+    Returns:
+        Tuple of (int8 vectors, float32 scales)
+    """
+    scales = np.abs(embeddings).max(axis=-1) / 127
+    scales[scales == 0] = 1
+    quantized = np.round(embeddings / scales[:, np.newaxis]).astype(np.int8)
+    return quantized, scales.astype(np.float32)
+
+
+def dequantize_int8(quantized: np.ndarray, scales: np.ndarray) -> np.ndarray:
+    """Restore float32 embeddings from int8 vectors and their scales."""
+    return quantized.astype(np.float32) * scales[:, np.newaxis]
+
+
+def get_embeddings(sagemaker_runtime, endpoint_name: str, texts: list[str]) -> np.ndarray:
+    """Get embedding vectors for several texts from a SageMaker endpoint in one call."""
+    if NPY_OUTPUT:
+        response = sagemaker_runtime.invoke_endpoint(
+            EndpointName=endpoint_name,
+            ContentType="application/json",
+            Accept="application/x-npy",
+            Body=json.dumps({"inputs": texts}),
+        )
+        # Raw float buffer: no JSON number parsing on the client
+        return parse_embeddings(np.load(io.BytesIO(response["Body"].read()), allow_pickle=False))
+
+    response = sagemaker_runtime.invoke_endpoint(
+        EndpointName=endpoint_name, ContentType="application/json", Body=json.dumps({"inputs": texts})
+    )
+    return parse_embeddings(json.loads(response["Body"].read()))
@@ -4,129 +4,264 @@ This script ingests all career knowledge base documents from the data directory.
 """
 
 import datetime
+import functools
+import hashlib
 import json
 import os
-import uuid
+import sqlite3
+import sys
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 
-import boto3
-from dotenv import load_dotenv
+import numpy as np
+from _embed import dequantize_int8, get_embeddings, make_client, new_vector_ids, normalize, quantize_int8
 
-# Load environment variables from project root
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# Load environment variables from project root when run as a script
 env_path = Path(__file__).parent.parent.parent / ".env"
-load_dotenv(env_path, override=True)
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    load_dotenv(env_path, override=True)
 
 # Get configuration
 VECTOR_BUCKET = os.getenv("VECTOR_BUCKET")
 SAGEMAKER_ENDPOINT = os.getenv("SAGEMAKER_ENDPOINT", "career-embedding-endpoint")
 INDEX_NAME = "career-knowledge"
+# Vectors are buffered across files and written this many per put_vectors call
+VECTOR_BATCH_SIZE = 100
+
+# Embeddings are cached locally so re-seeding and duplicate texts skip SageMaker
+EMBED_CACHE_DIR = Path(os.getenv("EMBED_CACHE_DIR", Path(__file__).parent / ".embedcache"))
 
-# Initialize AWS clients
-s3_vectors = boto3.client("s3vectors")
-sagemaker_runtime = boto3.client("sagemaker-runtime")
+# Int8 backup of the seeded vectors, used to re-seed without SageMaker
+BACKUP_PATH = Path(os.getenv("SEED_BACKUP_PATH", EMBED_CACHE_DIR / "knowledge_base_int8.npz"))
+
+# Files are processed in parallel, one per worker process
+SEED_WORKERS = int(os.getenv("SEED_WORKERS", os.cpu_count() or 1))
+# S3 Vectors writes run on background threads while workers keep embedding
+WRITE_CONCURRENCY = 4
+
+
+# Vectors waiting to be written to S3 Vectors
+_pending_vectors: list[dict] = []
+# Background writer (set in the parent process) and its in-flight writes
+_writer: ThreadPoolExecutor | None = None
+_write_futures: list[Future] = []
+# Worker processes only embed and buffer; the parent process does all writes
+_buffer_only = False
+# Per-process connection to the embedding cache, opened on first use
+_cache_db: sqlite3.Connection | None = None
+
+
+@functools.cache
+def _s3_vectors():
+    """S3 Vectors client, created on first use."""
+    return make_client("s3vectors")
+
+
+@functools.cache
+def _sagemaker_runtime():
+    """SageMaker runtime client, created on first use."""
+    return make_client("sagemaker-runtime")
+
+
+def get_embeddings_batch(texts: list[str]) -> np.ndarray:
+    """Get embedding vectors for several texts from the SageMaker endpoint in one call."""
+    return get_embeddings(_sagemaker_runtime(), SAGEMAKER_ENDPOINT, texts)
+
+
+def _embedding_cache() -> sqlite3.Connection:
+    """Open the local embedding cache, creating it on first use."""
+    global _cache_db
+    if _cache_db is None:
+        EMBED_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        _cache_db = sqlite3.connect(EMBED_CACHE_DIR / "embeddings.sqlite3", timeout=30)
+        _cache_db.execute("PRAGMA journal_mode=WAL")
+        _cache_db.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+    return _cache_db
+
+
+def _cache_key(text: str) -> str:
+    """Content address of a text for the current embedding endpoint."""
+    return hashlib.blake2b(f"{SAGEMAKER_ENDPOINT}|{text}".encode(), digest_size=32).hexdigest()
+
+
+def get_or_compute_many(texts: list[str]) -> np.ndarray:
+    """
+    Get embeddings from the local cache, calling SageMaker only for cache misses.
+
+    Texts are deduplicated by content hash first, so repeated texts are
+    embedded once and the same vector is fanned out to every occurrence.
+    """
+    db = _embedding_cache()
+    keys = [_cache_key(text) for text in texts]
+    cached = {}
+    for key in set(keys):
+        row = db.execute("SELECT vector FROM embeddings WHERE key = ?", (key,)).fetchone()
+        if row:
+            cached[key] = np.frombuffer(row[0], dtype=np.float32)
+
+    # Unique uncached texts only
+    misses = {key: text for key, text in zip(keys, texts, strict=True) if key not in cached}
+    reused = len(texts) - len(misses)
+    if reused:
+        print(f"    ↺ Reused {reused} duplicate or cached embeddings")
+    if misses:
+        embeddings = get_embeddings_batch(list(misses.values()))
+        with db:
+            db.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                [(key, emb.tobytes()) for key, emb in zip(misses, embeddings, strict=True)],
+            )
+        cached.update(zip(misses, embeddings, strict=True))
+
+    return np.stack([cached[key] for key in keys])
+
+
+def flush_batch(batch: list[dict]) -> None:
+    """Write a batch of vectors to S3 Vectors in one request."""
+    if batch:
+        _s3_vectors().put_vectors(vectorBucketName=VECTOR_BUCKET, indexName=INDEX_NAME, vectors=batch)
+
+
+def _submit_write(batch: list[dict]) -> None:
+    """Write a batch on the background writer if there is one, otherwise inline."""
+    if _writer is None:
+        flush_batch(batch)
+    else:
+        _write_futures.append(_writer.submit(flush_batch, batch))
+
+
+def flush_pending() -> None:
+    """Write out any buffered vectors and wait for all background writes to finish."""
+    batch = _pending_vectors[:]
+    _pending_vectors.clear()
+    _submit_write(batch)
+
+    futures = _write_futures[:]
+    _write_futures.clear()
+    for future in futures:
+        future.result()
+
+
+def queue_vectors(vectors: list[dict]) -> None:
+    """Buffer vectors, writing a full batch whenever VECTOR_BATCH_SIZE is reached."""
+    _pending_vectors.extend(vectors)
+    if _buffer_only:
+        return
+    while len(_pending_vectors) >= VECTOR_BATCH_SIZE:
+        batch = _pending_vectors[:VECTOR_BATCH_SIZE]
+        del _pending_vectors[:VECTOR_BATCH_SIZE]
+        _submit_write(batch)
 
 
-def get_embedding(text: str) -> list:
-    """Get embedding vector from SageMaker endpoint."""
-    response = sagemaker_runtime.invoke_endpoint(
-        EndpointName=SAGEMAKER_ENDPOINT, ContentType="application/json", Body=json.dumps({"inputs": text})
-    )
+def ingest_documents_bulk(texts: list[str], embeddings: np.ndarray, metadatas: list[dict]) -> list[str]:
+    """
+    Queue several embedded documents for S3 Vectors.
+
+    Vectors are written every VECTOR_BATCH_SIZE items; call flush_pending()
+    once all files are processed to write the remainder.
+    """
+    # Generate unique IDs for the vectors; one timestamp covers the whole batch
+    vector_ids = new_vector_ids(len(texts))
+    timestamp = datetime.datetime.now(datetime.UTC).isoformat()
 
-    result = json.loads(response["Body"].read().decode())
-    # HuggingFace returns nested array [[[embedding]]], extract the actual embedding
-    if isinstance(result, list) and len(result) > 0:
-        if isinstance(result[0], list) and len(result[0]) > 0:
-            if isinstance(result[0][0], list):
-                return result[0][0]  # Extract from [[[embedding]]]
-            return result[0]  # Extract from [[embedding]]
-    return result  # Return as-is if not nested
-
-
-def ingest_document(text: str, metadata: dict) -> str:
-    """Ingest a single document to S3 Vectors."""
-    # Get embedding from SageMaker
-    embedding = get_embedding(text)
-
-    # Generate unique ID for the vector
-    vector_id = str(uuid.uuid4())
-
-    # Store in S3 Vectors
-    s3_vectors.put_vectors(
-        vectorBucketName=VECTOR_BUCKET,
-        indexName=INDEX_NAME,
-        vectors=[
+    queue_vectors(
+        [
             {
                 "key": vector_id,
                 "data": {"float32": embedding},
-                "metadata": {"text": text, "timestamp": datetime.datetime.utcnow().isoformat(), **metadata},
+                "metadata": {"text": text, "timestamp": timestamp, **metadata},
             }
-        ],
+            for vector_id, text, embedding, metadata in zip(
+                vector_ids, texts, normalize(embeddings).tolist(), metadatas, strict=True
+            )
+        ]
     )
 
-    return vector_id
+    return vector_ids
 
 
-def process_bullet_template(file_path: Path) -> int:
-    """Process a CV bullet template file and ingest each bullet."""
-    count = 0
-    with open(file_path) as f:
-        data = json.load(f)
+def ingest_documents(texts: list[str], metadatas: list[dict]) -> list[str]:
+    """Embed several documents (cache misses in one SageMaker call) and queue them for S3 Vectors."""
+    if not texts:
+        return []
+    return ingest_documents_bulk(texts, get_or_compute_many(texts), metadatas)
+
+
+def process_bullet_template(file_path: Path) -> tuple[int, list[str]]:
+    """Process a CV bullet template file and ingest all its bullets in one batch."""
+    data = _loads(file_path.read_bytes())
 
     role_category = data.get("role_category", "general")
 
-    for bullet in data.get("bullets", []):
-        text = f"CV bullet example for {role_category.replace('_', ' ').title()}: {bullet['text']}"
-        metadata = {
-            "type": "cv_bullet_template",
-            "role_category": role_category,
+    # Text prefix and metadata fields shared by every bullet in the file
+    prefix = f"CV bullet example for {role_category.replace('_', ' ').title()}: "
+    base_meta = {"type": "cv_bullet_template", "role_category": role_category, "source_file": file_path.name}
+
+    bullets = data.get("bullets", [])
+    texts = [prefix + bullet["text"] for bullet in bullets]
+    metadatas = [
+        {
+            **base_meta,
             "skill_area": bullet.get("skill_area", "general"),
             "impact_type": bullet.get("impact_type", "qualitative"),
-            "source_file": file_path.name,
         }
-        try:
-            doc_id = ingest_document(text, metadata)
-            print(f"    ✓ Bullet: {bullet['text'][:50]}... -> {doc_id}")
-            count += 1
-        except Exception as e:
-            print(f"    ✗ Error: {e}")
+        for bullet in bullets
+    ]
 
-    return count
+    try:
+        doc_ids = ingest_documents(texts, metadatas)
+    except Exception as e:
+        return 0, [f"    ✗ Error: {e}"]
+
+    lines = [
+        f"    ✓ Bullet: {bullet['text'][:50]}... -> {doc_id}" for bullet, doc_id in zip(bullets, doc_ids, strict=True)
+    ]
+    return len(doc_ids), lines
 
 
-def process_interview_questions(file_path: Path) -> int:
-    """Process an interview question file and ingest each question."""
-    count = 0
-    with open(file_path) as f:
-        data = json.load(f)
+def process_interview_questions(file_path: Path) -> tuple[int, list[str]]:
+    """Process an interview question file and ingest all its questions in one batch."""
+    data = _loads(file_path.read_bytes())
 
     category = data.get("category", "general")
 
-    for question in data.get("questions", []):
-        text = f"Interview question ({category}): {question['question']}. "
-        text += f"What they're testing: {question.get('what_theyre_testing', 'Various skills')}. "
-        text += f"Good answer structure: {question.get('good_answer_structure', 'Use STAR method.')}"
+    # Text prefix and metadata fields shared by every question in the file
+    prefix = f"Interview question ({category}): "
+    base_meta = {"type": "interview_question", "category": category, "source_file": file_path.name}
 
-        metadata = {
-            "type": "interview_question",
-            "category": category,
-            "topic": question.get("topic", "general"),
-            "source_file": file_path.name,
-        }
-        try:
-            doc_id = ingest_document(text, metadata)
-            print(f"    ✓ Question: {question['question'][:40]}... -> {doc_id}")
-            count += 1
-        except Exception as e:
-            print(f"    ✗ Error: {e}")
+    questions = data.get("questions", [])
+    texts = [
+        f"{prefix}{question['question']}. "
+        f"What they're testing: {question.get('what_theyre_testing', 'Various skills')}. "
+        f"Good answer structure: {question.get('good_answer_structure', 'Use STAR method.')}"
+        for question in questions
+    ]
+    metadatas = [{**base_meta, "topic": question.get("topic", "general")} for question in questions]
+
+    try:
+        doc_ids = ingest_documents(texts, metadatas)
+    except Exception as e:
+        return 0, [f"    ✗ Error: {e}"]
 
-    return count
+    lines = [
+        f"    ✓ Question: {question['question'][:40]}... -> {doc_id}"
+        for question, doc_id in zip(questions, doc_ids, strict=True)
+    ]
+    return len(doc_ids), lines
 
 
-def process_ats_keywords(file_path: Path) -> int:
+def process_ats_keywords(file_path: Path) -> tuple[int, list[str]]:
     """Process an ATS keyword guide file and ingest it."""
-    count = 0
-    with open(file_path) as f:
-        data = json.load(f)
+    data = _loads(file_path.read_bytes())
 
     role = data.get("role", "general")
     industry = data.get("industry", "general")
@@ -143,17 +278,87 @@ def process_ats_keywords(file_path: Path) -> int:
 
     metadata = {"type": "ats_keyword_guide", "role": role, "industry": industry, "source_file": file_path.name}
     try:
-        doc_id = ingest_document(text, metadata)
-        print(f"    ✓ ATS Guide: {role} -> {doc_id}")
-        count += 1
+        (doc_id,) = ingest_documents([text], [metadata])
     except Exception as e:
-        print(f"    ✗ Error: {e}")
+        return 0, [f"    ✗ Error: {e}"]
+
+    return 1, [f"    ✓ ATS Guide: {role} -> {doc_id}"]
+
+
+def _init_worker() -> None:
+    """Create fresh AWS clients in each worker process (boto3 clients are not fork-safe)."""
+    global _buffer_only
+    _buffer_only = True
+    _s3_vectors.cache_clear()
+    _sagemaker_runtime.cache_clear()
+
 
-    return count
+def _process_in_worker(process_file, file_path: Path) -> tuple[int, list[dict], list[str]]:
+    """
+    Run a process_* function in a worker process.
+
+    Returns:
+        Tuple of (documents embedded, their vectors, progress lines) for the parent
+        to write and, once the writes succeed, print
+    """
+    count, lines = process_file(file_path)
+    vectors = _pending_vectors[:]
+    _pending_vectors.clear()
+    return count, vectors, lines
+
+
+def _json_files(directory: Path) -> list[str]:
+    """List a directory's JSON files in name order with one os.scandir pass."""
+    if not directory.is_dir():
+        return []
+    with os.scandir(directory) as entries:
+        return sorted(entry.path for entry in entries if entry.name.endswith(".json") and entry.is_file())
+
+
+def export_backup(vectors: list[dict], path: Path = BACKUP_PATH) -> None:
+    """
+    Save vectors as int8 with per-vector scales, plus their keys and metadata, to a compressed .npz.
+
+    Call only after every write has succeeded, so the backup never holds vectors missing from the index.
+    """
+    if not vectors:
+        return
+    quantized, scales = quantize_int8(np.array([v["data"]["float32"] for v in vectors], dtype=np.float32))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(
+        path,
+        vecs=quantized,
+        scales=scales,
+        keys=np.array([v["key"] for v in vectors]),
+        metadata=np.array([json.dumps(v["metadata"]) for v in vectors]),
+    )
+    print(f"💾 Saved int8 backup of {len(vectors)} vectors to {path}")
+
+
+def restore_knowledge_base(path: Path = BACKUP_PATH) -> None:
+    """Re-seed S3 Vectors from an int8 backup without calling SageMaker."""
+    if not VECTOR_BUCKET:
+        print("Error: VECTOR_BUCKET not set. Please run Guide 3 Step 4 to save it to .env")
+        return
+    if not path.exists():
+        print(f"Error: no backup found at {path}. Run a normal seed first.")
+        return
+
+    backup = np.load(path)
+    embeddings = normalize(dequantize_int8(backup["vecs"], backup["scales"]))
+    queue_vectors(
+        [
+            {"key": str(key), "data": {"float32": embedding}, "metadata": json.loads(str(metadata))}
+            for key, embedding, metadata in zip(backup["keys"], embeddings.tolist(), backup["metadata"], strict=True)
+        ]
+    )
+    flush_pending()
+    print(f"✅ Restored {len(embeddings)} vectors from {path}")
 
 
 def seed_knowledge_base():
     """Main function to seed all knowledge base content."""
+    global _writer
     if not VECTOR_BUCKET:
         print("Error: VECTOR_BUCKET not set. Please run Guide 3 Step 4 to save it to .env")
         return
@@ -168,36 +373,47 @@ def seed_knowledge_base():
 
     data_dir = Path(__file__).parent / "data"
     total_documents = 0
-
-    # Process CV bullet templates
-    bullets_dir = data_dir / "bullets"
-    if bullets_dir.exists():
-        print("📝 Processing CV Bullet Templates...")
-        for json_file in bullets_dir.glob("*.json"):
-            print(f"  File: {json_file.name}")
-            count = process_bullet_template(json_file)
-            total_documents += count
-        print()
-
-    # Process interview questions
-    interviews_dir = data_dir / "interviews"
-    if interviews_dir.exists():
-        print("🎤 Processing Interview Questions...")
-        for json_file in interviews_dir.glob("*.json"):
-            print(f"  File: {json_file.name}")
-            count = process_interview_questions(json_file)
-            total_documents += count
-        print()
-
-    # Process ATS keyword guides
-    ats_dir = data_dir / "ats"
-    if ats_dir.exists():
-        print("🔍 Processing ATS Keyword Guides...")
-        for json_file in ats_dir.glob("*.json"):
-            print(f"  File: {json_file.name}")
-            count = process_ats_keywords(json_file)
+    # Per-file progress, printed only once the file's vectors are written
+    reports: list[str] = []
+    # Every vector handed to the writer during this run, for the int8 backup
+    seeded_vectors: list[dict] = []
+
+    with (
+        ThreadPoolExecutor(max_workers=WRITE_CONCURRENCY) as _writer,
+        ProcessPoolExecutor(max_workers=SEED_WORKERS, initializer=_init_worker) as executor,
+    ):
+        # Files of every kind share one pool so bullets, questions and guides overlap
+        jobs = [
+            (label, process_file, Path(path))
+            for label, process_file, directory in (
+                ("📝 Bullets", process_bullet_template, data_dir / "bullets"),
+                ("🎤 Interviews", process_interview_questions, data_dir / "interviews"),
+                ("🔍 ATS", process_ats_keywords, data_dir / "ats"),
+            )
+            for path in _json_files(directory)
+        ]
+        results = executor.map(_process_in_worker, [job[1] for job in jobs], [job[2] for job in jobs])
+        for (label, _, file_path), (count, vectors, lines) in zip(jobs, results, strict=True):
+            queue_vectors(vectors)
+            seeded_vectors.extend(vectors)
             total_documents += count
-        print()
+            reports.append(f"  {label} - {file_path.name} ({count} documents)")
+            reports.extend(lines)
+
+        # Write any vectors still buffered and wait for the background writes
+        try:
+            flush_pending()
+        except Exception as e:
+            print(f"✗ Error writing vectors: {e}")
+            raise
+    _writer = None
+
+    # put_vectors batches span files, so no file is known to be written until every write has finished
+    sys.stdout.write("".join(f"{line}\n" for line in reports))
+    print()
+
+    # Every write has succeeded, so the backup holds exactly what is in the index
+    export_backup(seeded_vectors)
 
     print("=" * 60)
     print(f"✅ Seeding complete! Ingested {total_documents} documents.")
@@ -206,4 +422,7 @@ def seed_knowledge_base():
 
 
 if __name__ == "__main__":
-    seed_knowledge_base()
+    if "--restore" in sys.argv:
+        restore_knowledge_base()
+    else:
+        seed_knowledge_base()
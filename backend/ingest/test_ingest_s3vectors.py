@@ -4,60 +4,51 @@ This bypasses API Gateway and tests the S3 Vectors service directly.
 """
 
 import datetime
-import json
+import functools
 import os
-import uuid
 from pathlib import Path
 
-import boto3
-from dotenv import load_dotenv
+from _embed import get_embeddings, make_client, new_vector_ids, normalize
 
-# Load environment variables from project root
+# Load environment variables from project root when run as a script
 env_path = Path(__file__).parent.parent.parent / ".env"
-load_dotenv(env_path, override=True)
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    load_dotenv(env_path, override=True)
 
 # Get configuration
 VECTOR_BUCKET = os.getenv("VECTOR_BUCKET")
 SAGEMAKER_ENDPOINT = os.getenv("SAGEMAKER_ENDPOINT", "career-embedding-endpoint")
 INDEX_NAME = "career-knowledge"
 
-if not VECTOR_BUCKET:
-    print("Error: Please run Guide 3 Step 4 to save VECTOR_BUCKET to .env")
-    exit(1)
 
-# Initialize AWS clients
-s3_vectors = boto3.client("s3vectors")
-sagemaker_runtime = boto3.client("sagemaker-runtime")
+@functools.cache
+def _s3_vectors():
+    """S3 Vectors client, created on first use."""
+    return make_client("s3vectors")
 
 
-def get_embedding(text):
-    """Get embedding vector from SageMaker endpoint."""
-    response = sagemaker_runtime.invoke_endpoint(
-        EndpointName=SAGEMAKER_ENDPOINT, ContentType="application/json", Body=json.dumps({"inputs": text})
-    )
+@functools.cache
+def _sagemaker_runtime():
+    """SageMaker runtime client, created on first use."""
+    return make_client("sagemaker-runtime")
 
-    result = json.loads(response["Body"].read().decode())
-    # HuggingFace returns nested array [[[embedding]]], extract the actual embedding
-    if isinstance(result, list) and len(result) > 0:
-        if isinstance(result[0], list) and len(result[0]) > 0:
-            if isinstance(result[0][0], list):
-                return result[0][0]  # Extract from [[[embedding]]]
-            return result[0]  # Extract from [[embedding]]
-    return result  # Return as-is if not nested
 
+def get_embeddings_batch(texts):
+    """Get embedding vectors for several texts from the SageMaker endpoint in one call."""
+    return get_embeddings(_sagemaker_runtime(), SAGEMAKER_ENDPOINT, texts)
 
-def ingest_document(text, metadata=None):
-    """Ingest a document directly to S3 Vectors."""
-    # Get embedding from SageMaker
-    print(f"Getting embedding for text: {text[:100]}...")
-    embedding = get_embedding(text)
 
-    # Generate unique ID for the vector
-    vector_id = str(uuid.uuid4())
+def ingest_documents_bulk(texts, embeddings, metadatas):
+    """Ingest several embedded documents to S3 Vectors in one request."""
+    # Generate unique IDs for the vectors
+    vector_ids = new_vector_ids(len(texts))
+    timestamp = datetime.datetime.now(datetime.UTC).isoformat()
 
     # Store in S3 Vectors
-    print(f"Storing vector in bucket: {VECTOR_BUCKET}, index: {INDEX_NAME}")
-    s3_vectors.put_vectors(
+    print(f"Storing {len(texts)} vectors in bucket: {VECTOR_BUCKET}, index: {INDEX_NAME}")
+    _s3_vectors().put_vectors(
         vectorBucketName=VECTOR_BUCKET,
         indexName=INDEX_NAME,
         vectors=[
@@ -66,18 +57,24 @@ def ingest_document(text, metadata=None):
                 "data": {"float32": embedding},
                 "metadata": {
                     "text": text,
-                    "timestamp": datetime.datetime.utcnow().isoformat(),
+                    "timestamp": timestamp,
                     **(metadata or {}),  # Include any additional metadata
                 },
             }
+            for vector_id, text, embedding, metadata in zip(
+                vector_ids, texts, normalize(embeddings).tolist(), metadatas, strict=True
+            )
         ],
     )
 
-    return vector_id
+    return vector_ids
 
 
 def main():
     """Test direct ingestion to S3 Vectors."""
+    if not VECTOR_BUCKET:
+        print("Error: Please run Guide 3 Step 4 to save VECTOR_BUCKET to .env")
+        exit(1)
 
     print("Testing S3 Vectors Direct Ingestion")
     print("=" * 60)
@@ -118,15 +115,18 @@ def main():
         },
     ]
 
-    # Ingest each document
-    for i, doc in enumerate(test_docs, 1):
-        print(f"Ingesting document {i}: {doc['metadata'].get('type', 'Unknown')}")
-        try:
-            doc_id = ingest_document(doc["text"], doc["metadata"])
-            print(f"  ✓ Success! Document ID: {doc_id}")
-        except Exception as e:
-            print(f"  ✗ Error: {e}")
-        print()
+    # Embed all documents in one SageMaker call, then store them in one S3 Vectors call
+    texts = [doc["text"] for doc in test_docs]
+    metadatas = [doc["metadata"] for doc in test_docs]
+    print(f"Getting embeddings for {len(texts)} documents...")
+    try:
+        embeddings = get_embeddings_batch(texts)
+        doc_ids = ingest_documents_bulk(texts, embeddings, metadatas)
+        for i, (doc, doc_id) in enumerate(zip(test_docs, doc_ids, strict=True), 1):
+            print(f"  ✓ Document {i} ({doc['metadata'].get('type', 'Unknown')}): {doc_id}")
+    except Exception as e:
+        print(f"  ✗ Error: {e}")
+    print()
 
     print("Testing complete!")
     print("\nYour S3 Vectors knowledge base now contains career content:")
@@ -3,45 +3,73 @@ Test script for searching S3 Vectors.
 This demonstrates how to search the indexed documents.
 """
 
-import json
+import functools
 import os
 from pathlib import Path
 
-import boto3
-from dotenv import load_dotenv
+import numpy as np
+from _embed import get_embeddings, make_client, normalize
 
-# Load environment variables from project root
+# Load environment variables from project root when run as a script
 env_path = Path(__file__).parent.parent.parent / ".env"
-load_dotenv(env_path, override=True)
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    load_dotenv(env_path, override=True)
 
 # Get configuration
 VECTOR_BUCKET = os.getenv("VECTOR_BUCKET")
 SAGEMAKER_ENDPOINT = os.getenv("SAGEMAKER_ENDPOINT", "career-embedding-endpoint")
 INDEX_NAME = "career-knowledge"
+# Queries at least this similar to a previous query reuse its results
+SEMANTIC_CACHE_THRESHOLD = 0.97
+
+# Semantic cache: unit-normalized query embeddings in the first len(_cached_results) rows of a
+# preallocated float32 arena (grown by doubling), and their query_vectors results
+_cached_queries = np.empty((0, 0), dtype=np.float32)
+_cached_results: list[list[dict]] = []
+
 
-if not VECTOR_BUCKET:
-    print("Error: Please run Guide 3 Step 4 to save VECTOR_BUCKET to .env")
-    exit(1)
+@functools.cache
+def _s3_vectors():
+    """S3 Vectors client, created on first use."""
+    return make_client("s3vectors")
 
-# Initialize AWS clients
-s3_vectors = boto3.client("s3vectors")
-sagemaker_runtime = boto3.client("sagemaker-runtime")
+
+@functools.cache
+def _sagemaker_runtime():
+    """SageMaker runtime client, created on first use."""
+    return make_client("sagemaker-runtime")
 
 
 def get_embedding(text):
     """Get embedding vector from SageMaker endpoint."""
-    response = sagemaker_runtime.invoke_endpoint(
-        EndpointName=SAGEMAKER_ENDPOINT, ContentType="application/json", Body=json.dumps({"inputs": text})
-    )
-
-    result = json.loads(response["Body"].read().decode())
-    # HuggingFace returns nested array [[[embedding]]], extract the actual embedding
-    if isinstance(result, list) and len(result) > 0:
-        if isinstance(result[0], list) and len(result[0]) > 0:
-            if isinstance(result[0][0], list):
-                return result[0][0]  # Extract from [[[embedding]]]
-            return result[0]  # Extract from [[embedding]]
-    return result  # Return as-is if not nested
+    return get_embeddings(_sagemaker_runtime(), SAGEMAKER_ENDPOINT, [text])[0]
+
+
+def _semantic_cache_lookup(query: np.ndarray) -> list[dict] | None:
+    """Return cached results for the most similar previous query, if it is similar enough."""
+    if not _cached_results:
+        return None
+    similarities = _cached_queries[: len(_cached_results)] @ query
+    best = int(np.argmax(similarities))
+    if similarities[best] >= SEMANTIC_CACHE_THRESHOLD:
+        return _cached_results[best]
+    return None
+
+
+def _semantic_cache_store(query: np.ndarray, results: list[dict]) -> None:
+    """Add a query embedding and its results to the semantic cache."""
+    global _cached_queries
+    size = len(_cached_results)
+    if size == len(_cached_queries):
+        # Grow the arena geometrically instead of copying it on every insert
+        arena = np.empty((max(16, 2 * size), query.shape[0]), dtype=np.float32)
+        if size:
+            arena[:size] = _cached_queries
+        _cached_queries = arena
+    _cached_queries[size] = query
+    _cached_results.append(results)
 
 
 def list_all_vectors():
@@ -54,10 +82,10 @@ def list_all_vectors():
         # Search for a common term to get some results
         test_embedding = get_embedding("career interview resume")
 
-        response = s3_vectors.query_vectors(
+        response = _s3_vectors().query_vectors(
             vectorBucketName=VECTOR_BUCKET,
             indexName=INDEX_NAME,
-            queryVector={"float32": test_embedding},
+            queryVector={"float32": normalize(test_embedding).tolist()},
             topK=10,
             returnDistance=True,
             returnMetadata=True,
@@ -95,19 +123,25 @@ def search_vectors(query_text, k=5):
 
     try:
         # Get embedding for query
-        query_embedding = get_embedding(query_text)
-
-        # Search S3 Vectors
-        response = s3_vectors.query_vectors(
-            vectorBucketName=VECTOR_BUCKET,
-            indexName=INDEX_NAME,
-            queryVector={"float32": query_embedding},
-            topK=k,
-            returnDistance=True,
-            returnMetadata=True,
-        )
+        query = normalize(get_embedding(query_text))
+
+        # Reuse results of a near-identical earlier query, otherwise search S3 Vectors
+        vectors = _semantic_cache_lookup(query)
+        if vectors is not None and len(vectors) >= k:
+            vectors = vectors[:k]
+            print("(semantic cache hit)")
+        else:
+            response = _s3_vectors().query_vectors(
+                vectorBucketName=VECTOR_BUCKET,
+                indexName=INDEX_NAME,
+                queryVector={"float32": query.tolist()},
+                topK=k,
+                returnDistance=True,
+                returnMetadata=True,
+            )
+            vectors = response.get("vectors", [])
+            _semantic_cache_store(query, vectors)
 
-        vectors = response.get("vectors", [])
         print(f"Found {len(vectors)} results:\n")
 
         for vector in vectors:
@@ -126,6 +160,10 @@ def search_vectors(query_text, k=5):
 
 def main():
     """Explore the CareerAssist S3 Vectors knowledge base."""
+    if not VECTOR_BUCKET:
+        print("Error: Please run Guide 3 Step 4 to save VECTOR_BUCKET to .env")
+        exit(1)
+
     print("=" * 60)
     print("CareerAssist S3 Vectors Knowledge Base Explorer")
     print("=" * 60)
@@ -2,27 +2,53 @@
 Interviewer Agent - Generates interview questions and evaluates answers.
 """
 
+import asyncio
+import functools
+import io
 import json
 import logging
 import os
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Any
+from string import Template
+from typing import Any, Literal
 
+import numpy as np
 from agents import Agent, AgentOutputSchema, RunContextWrapper, Runner, function_tool, trace
 from agents.extensions.models.litellm_model import LitellmModel
 
+try:
+    import orjson
+
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    _loads = json.loads
+    _dumps = json.dumps
+
 logger = logging.getLogger()
 
 BEDROCK_MODEL_ID = os.getenv("BEDROCK_MODEL_ID", "us.anthropic.claude-3-7-sonnet-20250219-v1:0")
 BEDROCK_REGION = os.getenv("BEDROCK_REGION", "us-west-2")
+os.environ["AWS_REGION_NAME"] = BEDROCK_REGION
+
+# Pack cache: an identical request (same job, CV and gap analysis) within a warm container
+# reuses the earlier interview pack. Off by default; a re-run usually wants a fresh pack
+PACK_CACHE_ENABLED = os.getenv("PACK_CACHE_ENABLED", "false").lower() == "true"
+PACK_CACHE_TTL_SECONDS = int(os.getenv("PACK_CACHE_TTL_SECONDS", "3600"))
+
+# Request binary .npy embeddings instead of JSON (pooled-embedding models only)
+EMBEDDING_NPY_OUTPUT = os.getenv("EMBEDDING_NPY_OUTPUT", "false").lower() == "true"
+
+# Answers shorter than this are scored without calling the LLM
+MIN_ANSWER_CHARS = 20
 
 
 # Import schemas
 try:
     from src.schemas import AnswerEvaluation, InterviewPack, InterviewQuestion, InterviewType, QuestionDifficulty
 except ImportError:
-    from typing import Literal
-
     from pydantic import BaseModel, Field
 
     InterviewType = Literal["behavioral", "technical", "system_design", "situational", "motivation", "mixed"]
@@ -61,7 +87,114 @@ except ImportError:
         better_answer_example: str = Field(description="Example of an improved answer")
 
 
+from src.response_cache import ResponseCache
 from templates import ANSWER_EVALUATION_PROMPT, INTERVIEW_PREP_PROMPT
+from vector_ops import query_local_index
+
+_pack_cache = ResponseCache(ttl_seconds=PACK_CACHE_TTL_SECONDS)
+
+
+@functools.lru_cache(maxsize=4)
+def _get_model() -> LitellmModel:
+    """Build the Bedrock model once per container."""
+    return LitellmModel(model=f"bedrock/{BEDROCK_MODEL_ID}")
+
+
+@functools.lru_cache(maxsize=4)
+def _get_agent(kind: Literal["pack", "eval"]) -> Agent:
+    """Build each agent (and its output schema) once; only the task string varies per call."""
+    if kind == "pack":
+        return Agent(name="Interview Coach", instructions=INTERVIEW_PREP_PROMPT, model=_get_model())
+    return Agent(
+        name="Interview Evaluator",
+        instructions=ANSWER_EVALUATION_PROMPT,
+        model=_get_model(),
+        output_type=AgentOutputSchema(AnswerEvaluation, strict_json_schema=False),
+    )
+
+
+# Per-call task prompts; only the substituted fields vary between calls
+_PACK_TASK_TMPL = Template(
+    """Generate an interview preparation pack for this role.
+
+$job_text
+
+$gap_text
+
+Job ID: $job_id
+Company: $company
+Role: $role
+
+Generate:
+1. 8-12 interview questions covering behavioral, technical, and situational types
+2. Focus areas for preparation
+3. Company-specific tips if known
+4. General interview tips for this role type
+
+For each question:
+- Assign a unique ID (use format: q1, q2, etc.)
+- Specify what the interviewer is testing
+- Provide an answer outline
+- Include potential follow-up questions
+- Mark if it addresses a gap from the analysis
+
+IMPORTANT: Return your response as a single JSON object with this exact structure:
+{
+  "job_id": "$job_id",
+  "company": "<company name>",
+  "role": "<role title>",
+  "questions": [
+    {
+      "id": "q1",
+      "question": "<the question>",
+      "type": "<behavioral|technical|system_design|situational|motivation|mixed>",
+      "topic": "<topic area>",
+      "difficulty": "<easy|medium|hard>",
+      "what_theyre_testing": "<what this assesses>",
+      "sample_answer_outline": "<outline of a good answer>",
+      "follow_up_questions": ["<follow-up 1>", "<follow-up 2>"],
+      "company_specific": false,
+      "gap_related": false
+    }
+  ],
+  "focus_areas": ["<area 1>", "<area 2>"],
+  "company_specific_tips": ["<tip 1>"],
+  "general_tips": ["<tip 1>", "<tip 2>"]
+}
+
+Return ONLY the JSON object, no other text."""
+)
+
+_EVAL_TASK_TMPL = Template(
+    """Evaluate this interview answer.
+
+**Question:** $question
+**Type:** $question_type
+**What they're testing:** $what_theyre_testing
+
+**Candidate's Answer:**
+$answer
+
+Provide:
+1. Overall score (1-5)
+2. Whether STAR method was used (for behavioral questions)
+3. Clarity, relevance, and depth scores (1-5 each)
+4. Specific strengths of the answer
+5. Areas for improvement
+6. Example of a better answer
+
+Question ID: $question_id"""
+)
+
+_COACH_TASK_TMPL = Template(
+    """Prepare interview coaching for this role.
+
+$job_text
+
+$gap_text
+
+Use available tools to find relevant interview questions, then provide comprehensive preparation."""
+)
 
 
 @dataclass
@@ -83,17 +216,14 @@ def format_job_for_interview(job_profile: dict[str, Any]) -> str:
         "",
     ]
 
-    if job_profile.get("must_have"):
+    if must_have := job_profile.get("must_have"):
         lines.append("**Key Requirements:**")
-        for req in job_profile["must_have"][:8]:
-            text = req.get("text", "") if isinstance(req, dict) else str(req)
-            lines.append(f"- {text}")
+        lines.extend(f"- {req.get('text', '') if isinstance(req, dict) else req}" for req in must_have[:8])
         lines.append("")
 
-    if job_profile.get("responsibilities"):
+    if responsibilities := job_profile.get("responsibilities"):
         lines.append("**Responsibilities:**")
-        for resp in job_profile["responsibilities"][:6]:
-            lines.append(f"- {resp}")
+        lines.extend(f"- {resp}" for resp in responsibilities[:6])
         lines.append("")
 
     return "\n".join(lines)
@@ -105,13 +235,128 @@ def format_gaps_for_interview(gap_analysis: dict[str, Any]) -> str:
         return ""
 
     lines = ["## Candidate Gaps to Address:"]
-    for gap in gap_analysis.get("gaps", [])[:5]:
-        if isinstance(gap, dict):
-            lines.append(f"- {gap.get('missing_element', gap.get('requirement', ''))}")
+    lines.extend(
+        f"- {gap.get('missing_element', gap.get('requirement', ''))}"
+        for gap in gap_analysis.get("gaps", [])[:5]
+        if isinstance(gap, dict)
+    )
 
     return "\n".join(lines)
 
 
+# Vector bucket for interview questions; derived from the account ID via STS only when unset
+_vector_bucket = os.getenv("VECTOR_BUCKET")
+_vector_bucket_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=4)
+def _aws_client(service_name: str):
+    """Create a boto3 client once per container; they are thread-safe and reused across calls."""
+    import boto3
+
+    return boto3.client(service_name, region_name=os.getenv("DEFAULT_AWS_REGION", "us-east-1"))
+
+
+def _get_vector_bucket() -> str:
+    """Return the vector bucket name, calling STS at most once per container."""
+    global _vector_bucket
+    if _vector_bucket is None:
+        with _vector_bucket_lock:
+            if _vector_bucket is None:
+                account_id = _aws_client("sts").get_caller_identity()["Account"]
+                _vector_bucket = f"career-vectors-{account_id}"
+    return _vector_bucket
+
+
+def _embed_texts(texts: list[str]) -> list[list[float]]:
+    """Embed several texts with the SageMaker embedding endpoint in one call."""
+    kwargs = {"Accept": "application/x-npy"} if EMBEDDING_NPY_OUTPUT else {}
+    response = _aws_client("sagemaker-runtime").invoke_endpoint(
+        EndpointName=os.getenv("SAGEMAKER_ENDPOINT", "career-embedding-endpoint"),
+        ContentType="application/json",
+        Body=_dumps({"inputs": texts}),
+        **kwargs,
+    )
+
+    body = response["Body"].read()
+    result = np.load(io.BytesIO(body), allow_pickle=False) if EMBEDDING_NPY_OUTPUT else _loads(body)
+
+    # Each input's embedding comes back nested ([[embedding]]) or per token; keep the first vector
+    embeddings = []
+    for item in result:
+        vectors = np.asarray(item, dtype=np.float32)
+        embeddings.append(vectors.reshape(-1, vectors.shape[-1])[0].tolist())
+    return embeddings
+
+
+class _EmbeddingBatcher:
+    """
+    Coalesce embedding requests made within a short window into one endpoint call.
+
+    Concurrent awaiters (e.g. knowledge-base lookups from parallel tool
+    calls) share a single SageMaker round-trip.
+    """
+
+    def __init__(self, window_seconds: float = 0.005):
+        self.window_seconds = window_seconds
+        self._pending: list[tuple[str, asyncio.Future]] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def embed(self, text: str) -> list[float]:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Each Lambda invocation runs its own event loop
+            self._loop, self._pending = loop, []
+
+        future = loop.create_future()
+        self._pending.append((text, future))
+        if len(self._pending) == 1:
+            loop.call_later(self.window_seconds, self._start_flush)
+        return await future
+
+    def _start_flush(self) -> None:
+        task = self._loop.create_task(self._flush(self._pending))
+        self._pending = []
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _flush(self, batch: list[tuple[str, asyncio.Future]]) -> None:
+        try:
+            embeddings = await asyncio.to_thread(_embed_texts, [text for text, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), embedding in zip(batch, embeddings, strict=True):
+            if not future.done():
+                future.set_result(embedding)
+
+
+_embedding_batcher = _EmbeddingBatcher()
+_embedding_cache: OrderedDict[str, tuple[float, ...]] = OrderedDict()
+EMBEDDING_CACHE_SIZE = 2048
+
+
+async def _embed(text: str) -> list[float]:
+    """
+    Embed text, reusing earlier results for repeated queries.
+
+    The embedding model is uncased, so the cache is keyed on the lowercased text.
+    """
+    key = text.lower()
+    embedding = _embedding_cache.get(key)
+    if embedding is None:
+        embedding = tuple(await _embedding_batcher.embed(key))
+        _embedding_cache[key] = embedding
+        if len(_embedding_cache) > EMBEDDING_CACHE_SIZE:
+            _embedding_cache.popitem(last=False)
+    else:
+        _embedding_cache.move_to_end(key)
+    return list(embedding)
+
+
 @function_tool
 async def get_interview_questions(wrapper: RunContextWrapper[InterviewerContext], role_type: str, company: str) -> str:
     """
@@ -125,51 +370,38 @@ async def get_interview_questions(wrapper: RunContextWrapper[InterviewerContext]
         Relevant interview questions from database
     """
     try:
-        import boto3
-
-        sts = boto3.client("sts")
-        account_id = sts.get_caller_identity()["Account"]
-        bucket = f"career-vectors-{account_id}"
-
-        sagemaker_region = os.getenv("DEFAULT_AWS_REGION", "us-east-1")
-        sagemaker = boto3.client("sagemaker-runtime", region_name=sagemaker_region)
-        endpoint_name = os.getenv("SAGEMAKER_ENDPOINT", "career-embedding-endpoint")
         query = f"interview questions for {role_type} at {company}"
+        embedding = await _embed(query)
+    except Exception as e:
+        logger.warning(f"Could not retrieve interview questions: {e}")
+        return "Questions database unavailable - generate based on job requirements."
 
-        response = sagemaker.invoke_endpoint(
-            EndpointName=endpoint_name,
-            ContentType="application/json",
-            Body=json.dumps({"inputs": query}),
-        )
-
-        result = json.loads(response["Body"].read().decode())
-        if isinstance(result, list) and result:
-            embedding = result[0][0] if isinstance(result[0], list) else result[0]
-        else:
-            embedding = result
-
-        s3v = boto3.client("s3vectors", region_name=sagemaker_region)
-        response = s3v.query_vectors(
-            vectorBucketName=bucket,
+    try:
+        response = _aws_client("s3vectors").query_vectors(
+            vectorBucketName=_get_vector_bucket(),
             indexName="interview-questions",
             queryVector={"float32": embedding},
             topK=5,
             returnMetadata=True,
         )
+        metadatas = [vector.get("metadata", {}) for vector in response.get("vectors", [])]
+    except Exception as e:
+        logger.warning(f"S3 Vectors query failed, trying local index: {e}")
+        try:
+            metadatas = query_local_index(embedding, top_k=5, vector_type="interview_question")
+        except Exception as local_error:
+            logger.warning(f"Could not retrieve interview questions: {local_error}")
+            return "Questions database unavailable - generate based on job requirements."
 
-        questions = []
-        for vector in response.get("vectors", []):
-            metadata = vector.get("metadata", {})
-            q_list = metadata.get("questions", [])
-            questions.extend(q_list)
-
-        if questions:
-            return "Common interview questions:\n" + "\n".join(f"• {q}" for q in questions[:8])
-        return "No specific questions found - generate based on job requirements."
+    questions = []
+    for metadata in metadatas:
+        # S3 Vectors entries carry a list of questions; seeded knowledge-base entries carry the text
+        q_list = metadata.get("questions") or ([metadata["text"]] if metadata.get("text") else [])
+        questions.extend(q_list)
 
-    except Exception as e:
-        logger.warning(f"Could not retrieve interview questions: {e}")
-        return "Questions database unavailable - generate based on job requirements."
+    if questions:
+        return "Common interview questions:\n" + "\n".join(f"• {q}" for q in questions[:8])
+    return "No specific questions found - generate based on job requirements."
 
 
 def _extract_json_from_text(text: str) -> dict[str, Any]:
@@ -179,7 +411,7 @@ def _extract_json_from_text(text: str) -> dict[str, Any]:
 
     json_match = re.search(r"```(?:json)?\s*(\{.*?\})\s*```", text, re.DOTALL)
     if json_match:
-        return json.loads(json_match.group(1))
+        return _loads(json_match.group(1))
 
     # Try to find raw JSON object
     start = text.find("{")
@@ -194,7 +426,7 @@ def _extract_json_from_text(text: str) -> dict[str, Any]:
         elif text[i] == "}":
             depth -= 1
             if depth == 0:
-                return json.loads(text[start : i + 1])
+                return _loads(text[start : i + 1])
 
     raise ValueError("No complete JSON object found in response")
 
@@ -218,66 +450,25 @@ async def generate_interview_pack(
     Returns:
         InterviewPack with questions and tips
     """
-    os.environ["AWS_REGION_NAME"] = BEDROCK_REGION
-    model = LitellmModel(model=f"bedrock/{BEDROCK_MODEL_ID}")
-
     job_text = format_job_for_interview(job_profile)
     gap_text = format_gaps_for_interview(gap_analysis) if gap_analysis else ""
 
-    agent = Agent(
-        name="Interview Coach",
-        instructions=INTERVIEW_PREP_PROMPT,
-        model=model,
-    )
-
-    task = f"""Generate an interview preparation pack for this role.
-
-{job_text}
-
-{gap_text}
-
-Job ID: {job_id}
-Company: {job_profile.get("company", "Unknown")}
-Role: {job_profile.get("role_title", "Unknown")}
+    cache_key = None
+    if PACK_CACHE_ENABLED:
+        cache_key = ResponseCache.key(
+            "pack", {"job_profile": job_profile, "cv_profile": cv_profile, "gap_analysis": gap_analysis}
+        )
+        if cached := _pack_cache.get(cache_key):
+            logger.info("Interview pack served from cache")
+            return InterviewPack.model_validate({**cached, "job_id": job_id})
 
-Generate:
-1. 8-12 interview questions covering behavioral, technical, and situational types
-2. Focus areas for preparation
-3. Company-specific tips if known
-4. General interview tips for this role type
+    agent = _get_agent("pack")
+    company = job_profile.get("company", "Unknown")
+    role_title = job_profile.get("role_title", "Unknown")
 
-For each question:
-- Assign a unique ID (use format: q1, q2, etc.)
-- Specify what the interviewer is testing
-- Provide an answer outline
-- Include potential follow-up questions
-- Mark if it addresses a gap from the analysis
-
-IMPORTANT: Return your response as a single JSON object with this exact structure:
-{{
-  "job_id": "{job_id}",
-  "company": "<company name>",
-  "role": "<role title>",
-  "questions": [
-    {{
-      "id": "q1",
-      "question": "<the question>",
-      "type": "<behavioral|technical|system_design|situational|motivation|mixed>",
-      "topic": "<topic area>",
-      "difficulty": "<easy|medium|hard>",
-      "what_theyre_testing": "<what this assesses>",
-      "sample_answer_outline": "<outline of a good answer>",
-      "follow_up_questions": ["<follow-up 1>", "<follow-up 2>"],
-      "company_specific": false,
-      "gap_related": false
-    }}
-  ],
-  "focus_areas": ["<area 1>", "<area 2>"],
-  "company_specific_tips": ["<tip 1>"],
-  "general_tips": ["<tip 1>", "<tip 2>"]
-}}
-
-Return ONLY the JSON object, no other text."""
+    task = _PACK_TASK_TMPL.substitute(
+        job_text=job_text, gap_text=gap_text, job_id=job_id, company=company, role=role_title
+    )
 
     with trace("Interview Pack Generation"):
         result = await Runner.run(agent, input=task)
@@ -293,9 +484,42 @@ Return ONLY the JSON object, no other text."""
 
     pack = InterviewPack(**data)
     logger.info(f"Generated interview pack with {len(pack.questions)} questions")
+    if cache_key is not None:
+        _pack_cache.put(cache_key, pack.model_dump(mode="json"))
     return pack
 
 
+def _short_answer_evaluation(question: InterviewQuestion, answer: str) -> AnswerEvaluation | None:
+    """Return the fixed minimum-score evaluation for an empty or near-empty answer, else None."""
+    if len(answer.strip()) >= MIN_ANSWER_CHARS:
+        return None
+    return AnswerEvaluation(
+        question_id=question.id,
+        score=1,
+        star_method_used=False if question.type == "behavioral" else None,
+        clarity=1,
+        relevance=1,
+        depth=1,
+        strengths=[],
+        improvements=["Answer too short; provide a complete response."],
+        better_answer_example=question.sample_answer_outline,
+    )
+
+
+async def _run_evaluation(question: InterviewQuestion, answer: str) -> AnswerEvaluation:
+    """Evaluate one answer with the evaluator agent in the caller's trace."""
+    task = _EVAL_TASK_TMPL.substitute(
+        question=question.question,
+        question_type=question.type,
+        what_theyre_testing=question.what_theyre_testing,
+        answer=answer,
+        question_id=question.id,
+    )
+    result = await Runner.run(_get_agent("eval"), input=task)
+
+    return result.final_output
+
+
 async def evaluate_answer(question: InterviewQuestion, answer: str) -> AnswerEvaluation:
     """
     Evaluate a candidate's interview answer.
@@ -307,39 +531,36 @@ async def evaluate_answer(question: InterviewQuestion, answer: str) -> AnswerEva
     Returns:
         AnswerEvaluation with scores and feedback
     """
-    os.environ["AWS_REGION_NAME"] = BEDROCK_REGION
-    model = LitellmModel(model=f"bedrock/{BEDROCK_MODEL_ID}")
+    if evaluation := _short_answer_evaluation(question, answer):
+        return evaluation
 
-    agent = Agent(
-        name="Interview Evaluator",
-        instructions=ANSWER_EVALUATION_PROMPT,
-        model=model,
-        output_type=AgentOutputSchema(AnswerEvaluation, strict_json_schema=False),
-    )
-
-    task = f"""Evaluate this interview answer.
+    with trace("Answer Evaluation"):
+        return await _run_evaluation(question, answer)
 
-**Question:** {question.question}
-**Type:** {question.type}
-**What they're testing:** {question.what_theyre_testing}
 
-**Candidate's Answer:**
-{answer}
+async def evaluate_answers_batch(
+    pairs: list[tuple[InterviewQuestion, str]], max_concurrency: int = 8
+) -> list[AnswerEvaluation]:
+    """
+    Evaluate several interview answers concurrently under one trace.
 
-Provide:
-1. Overall score (1-5)
-2. Whether STAR method was used (for behavioral questions)
-3. Clarity, relevance, and depth scores (1-5 each)
-4. Specific strengths of the answer
-5. Areas for improvement
-6. Example of a better answer
+    Args:
+        pairs: (question, answer) pairs to evaluate
+        max_concurrency: Maximum number of Bedrock calls in flight
 
-Question ID: {question.id}"""
+    Returns:
+        AnswerEvaluations in the same order as pairs
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
 
-    with trace("Answer Evaluation"):
-        result = await Runner.run(agent, input=task)
+    async def evaluate_one(question: InterviewQuestion, answer: str) -> AnswerEvaluation:
+        if evaluation := _short_answer_evaluation(question, answer):
+            return evaluation
+        async with semaphore:
+            return await _run_evaluation(question, answer)
 
-    return result.final_output
+    with trace("Answer Evaluation Batch"):
+        return await asyncio.gather(*(evaluate_one(question, answer) for question, answer in pairs))
 
 
 def create_agent(
@@ -351,8 +572,7 @@ def create_agent(
 ):
     """Create the interviewer agent with tools and context."""
 
-    os.environ["AWS_REGION_NAME"] = BEDROCK_REGION
-    model = LitellmModel(model=f"bedrock/{BEDROCK_MODEL_ID}")
+    model = _get_model()
 
     context = InterviewerContext(
         job_id=job_id, job_profile=job_profile, cv_profile=cv_profile, gap_analysis=gap_analysis, db=db
@@ -363,12 +583,6 @@ def create_agent(
     job_text = format_job_for_interview(job_profile)
     gap_text = format_gaps_for_interview(gap_analysis) if gap_analysis else ""
 
-    task = f"""Prepare interview coaching for this role.
-
-{job_text}
-
-{gap_text}
-
-Use available tools to find relevant interview questions, then provide comprehensive preparation."""
+    task = _COACH_TASK_TMPL.substitute(job_text=job_text, gap_text=gap_text)
 
     return model, tools, task, context
@@ -5,6 +5,8 @@ Drops all tables, recreates schema, and optionally loads seed data
 """
 
 import argparse
+import contextlib
+import io
 import sys
 
 from src.client import DataAPIClient
@@ -12,8 +14,8 @@ from src.models import Database
 from src.schemas import CVVersionCreate, JobPostingCreate, UserProfileCreate
 
 
-def drop_all_tables(db: DataAPIClient):
-    """Drop all CareerAssist tables in correct order (respecting foreign keys)"""
+def drop_all_tables(db: DataAPIClient) -> bool:
+    """Drop all CareerAssist tables in correct order (respecting foreign keys); returns False on error"""
     print("🗑️  Dropping existing tables...")
 
     # Order matters due to foreign key constraints
@@ -39,26 +41,37 @@ def drop_all_tables(db: DataAPIClient):
     # Drop views first
     views_to_drop = ["application_pipeline_stats", "recent_gap_analyses"]
 
-    for view in views_to_drop:
-        try:
-            db.execute(f"DROP VIEW IF EXISTS {view} CASCADE")
-            print(f"   ✅ Dropped view {view}")
-        except Exception:
-            pass  # Views might not exist
-
-    for table in tables_to_drop:
-        try:
-            db.execute(f"DROP TABLE IF EXISTS {table} CASCADE")
-            print(f"   ✅ Dropped {table}")
-        except Exception as e:
-            print(f"   ⚠️  Error dropping {table}: {e}")
+    # Drop everything in one round-trip: the loops run server-side in a PL/pgSQL block.
+    # update_updated_at_column() is kept: its triggers go with the tables and the
+    # migrations recreate it with CREATE OR REPLACE.
+    views_sql = ", ".join(f"'{view}'" for view in views_to_drop)
+    tables_sql = ", ".join(f"'{table}'" for table in tables_to_drop)
+    sql = f"""
+        DO $$
+        DECLARE
+            name text;
+        BEGIN
+            FOREACH name IN ARRAY ARRAY[{views_sql}] LOOP
+                EXECUTE 'DROP VIEW IF EXISTS ' || quote_ident(name) || ' CASCADE';
+            END LOOP;
+            FOREACH name IN ARRAY ARRAY[{tables_sql}] LOOP
+                EXECUTE 'DROP TABLE IF EXISTS ' || quote_ident(name) || ' CASCADE';
+            END LOOP;
+        END $$
+    """
 
-    # Also drop the function
     try:
-        db.execute("DROP FUNCTION IF EXISTS update_updated_at_column() CASCADE")
-        print("   ✅ Dropped update_updated_at_column function")
+        db.execute(sql)
     except Exception as e:
-        print(f"   ⚠️  Error dropping function: {e}")
+        # The block is atomic, so an error means nothing was dropped
+        print(f"   ❌ Error dropping tables: {e}")
+        return False
+
+    for view in views_to_drop:
+        print(f"   ✅ Dropped view {view}")
+    for table in tables_to_drop:
+        print(f"   ✅ Dropped {table}")
+    return True
 
 
 def create_test_user_and_data(db_models: Database):
@@ -169,6 +182,34 @@ Benefits:
         print(f"   ✅ Created sample job posting: {job_id}")
 
 
+def run_captured(func) -> tuple[bool, str]:
+    """Run another script's entry point in this process, capturing its output"""
+    output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+            func()
+    except SystemExit as e:
+        return not e.code, output.getvalue()
+    except Exception as e:
+        return False, f"{output.getvalue()}{e}\n"
+    return True, output.getvalue()
+
+
+def run_migrations_in_process(db: DataAPIClient):
+    """Run the default migrations over this script's Data API connection"""
+    import run_migrations
+
+    run_migrations.client = db.client
+    run_migrations.main([])
+
+
+def run_seed_in_process():
+    """Load the seed data"""
+    from seed_career_data import main as seed_main
+
+    seed_main()
+
+
 def main():
     parser = argparse.ArgumentParser(description="Reset CareerAssist database")
     parser.add_argument("--with-test-data", action="store_true", help="Create test user with sample CV and job posting")
@@ -185,17 +226,17 @@ def main():
 
     if not args.skip_drop:
         # Drop all tables
-        drop_all_tables(db)
+        if not drop_all_tables(db):
+            print("❌ Dropping tables failed!")
+            sys.exit(1)
 
         # Run migrations
         print("\n📝 Running migrations...")
-        import subprocess
-
-        result = subprocess.run(["uv", "run", "run_migrations.py"], capture_output=True, text=True)
+        ok, output = run_captured(lambda: run_migrations_in_process(db))
 
-        if result.returncode != 0:
+        if not ok:
             print("❌ Migration failed!")
-            print(result.stderr)
+            print(output)
             sys.exit(1)
         else:
             print("✅ Migrations completed")
@@ -203,13 +244,11 @@ def main():
     # Load seed data if requested
     if args.seed:
         print("\n🌱 Loading seed data...")
-        import subprocess
+        ok, output = run_captured(run_seed_in_process)
 
-        result = subprocess.run(["uv", "run", "seed_career_data.py"], capture_output=True, text=True)
-
-        if result.returncode != 0:
+        if not ok:
             print("❌ Seed data failed!")
-            print(result.stderr)
+            print(output)
             sys.exit(1)
         else:
             print("✅ Seed data loaded")
@@ -234,13 +273,21 @@ def main():
         "skill_categories",
     ]
 
-    for table in tables:
-        try:
-            result = db.query(f"SELECT COUNT(*) as count FROM {table}")
-            count = result[0]["count"] if result else 0
-            print(f"   • {table:<25} {count:>5} records")
-        except Exception as e:
-            print(f"   • {table:<25} ⚠️  Error: {str(e)[:30]}")
+    # Exact counts for every table in one round-trip
+    sql = " UNION ALL ".join(f"SELECT '{table}' AS name, COUNT(*) AS count FROM {table}" for table in tables)
+    try:
+        counts = {row["name"]: row["count"] for row in db.query(sql)}
+        for table in tables:
+            print(f"   • {table:<25} {counts.get(table, 0):>5} records")
+    except Exception:
+        # A missing table fails the combined query; count per table to show which one
+        for table in tables:
+            try:
+                result = db.query(f"SELECT COUNT(*) as count FROM {table}")
+                count = result[0]["count"] if result else 0
+                print(f"   • {table:<25} {count:>5} records")
+            except Exception as e:
+                print(f"   • {table:<25} ⚠️  Error: {str(e)[:30]}")
 
     print("\n" + "=" * 50)
     print("✅ Database reset complete!")
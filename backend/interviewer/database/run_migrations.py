@@ -10,6 +10,7 @@ import sys
 from pathlib import Path
 
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from dotenv import load_dotenv
 
@@ -25,7 +26,12 @@ region = os.environ.get("DEFAULT_AWS_REGION", "us-east-1")
 if not cluster_arn or not secret_arn:
     raise ValueError("Missing AURORA_CLUSTER_ARN or AURORA_SECRET_ARN in environment variables")
 
-client = boto3.client("rds-data", region_name=region)
+# Keep-alive pool reused by every statement instead of reconnecting after idle gaps
+client = boto3.client(
+    "rds-data",
+    region_name=region,
+    config=Config(max_pool_connections=10, retries={"mode": "standard", "max_attempts": 3}, tcp_keepalive=True),
+)
 
 
 def execute_statement(sql: str) -> dict:
@@ -127,14 +133,14 @@ def run_migration_file(file_path: Path):
     return success_count, error_count
 
 
-def main():
+def main(argv: list[str] | None = None):
     parser = argparse.ArgumentParser(description="Run CareerAssist database migrations")
     parser.add_argument(
         "--schema", choices=["alex", "career"], default="career", help="Which schema to run (alex = 001, career = 002)"
     )
     parser.add_argument("--all", action="store_true", help="Run all migrations in order")
     parser.add_argument("--file", type=str, help="Run a specific migration file")
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     print("🚀 CareerAssist Database Migration Runner")
     print("=" * 50)
@@ -5,16 +5,33 @@ Interviewer Agent Lambda Handler - Interview Prep and Answer Evaluation.
 import asyncio
 import json
 import logging
+import os
 from typing import Any
 
+# Lambda supplies its configuration as environment variables; .env files are for local runs
+if not os.getenv("AWS_LAMBDA_FUNCTION_NAME"):
+    try:
+        from dotenv import load_dotenv
+
+        load_dotenv(override=True)
+    except ImportError:
+        pass
+
 try:
-    from dotenv import load_dotenv
+    import orjson
 
-    load_dotenv(override=True)
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj, default=str).decode()
+
+    _loads = orjson.loads
 except ImportError:
-    pass
 
-from agent import evaluate_answer, generate_interview_pack
+    def _dumps(obj: Any) -> str:
+        return json.dumps(obj, default=str)
+
+    _loads = json.loads
+
+from agent import InterviewQuestion, evaluate_answer, evaluate_answers_batch, generate_interview_pack
 from observability import extract_trace_context, log_span, observe
 from src import Database
 
@@ -23,6 +40,35 @@ logger.setLevel(logging.INFO)
 
 db = Database()
 
+# Reused across warm invocations instead of creating and closing a loop per event
+_LOOP = asyncio.new_event_loop()
+asyncio.set_event_loop(_LOOP)
+
+# Shared trace metadata for the known event types; observe() only reads it
+_EVENT_METADATA = {
+    event_type: {"event_type": event_type}
+    for event_type in ("interview_prep", "answer_evaluation", "answer_evaluation_batch")
+}
+
+# Database writes still in flight; drained before the handler returns because
+# Lambda freezes the container (and this loop) as soon as it responds
+_PENDING_WRITES: set[asyncio.Task] = set()
+
+
+async def _persist_interview_pack(job_id: str, pack_dict: dict[str, Any]) -> None:
+    """Save an interview pack to the jobs table."""
+    try:
+        await asyncio.to_thread(db.jobs.update_interviewer, job_id, {"interview_pack": pack_dict})
+        logger.info(f"✅ Saved interview prep to job {job_id}")
+    except Exception as e:
+        logger.warning(f"⚠️ Could not save to database: {e}")
+
+
+async def _drain_pending_writes() -> None:
+    """Wait for every background database write to finish."""
+    while _PENDING_WRITES:
+        await asyncio.gather(*_PENDING_WRITES)
+
 
 async def run_interview_prep(
     job_id: str,
@@ -38,6 +84,11 @@ async def run_interview_prep(
         pack = await generate_interview_pack(job_id, job_profile, cv_profile, gap_analysis)
         pack_dict = pack.model_dump()
 
+        # Save to jobs table in the background while the response is logged and serialized
+        task = asyncio.create_task(_persist_interview_pack(job_id, pack_dict))
+        _PENDING_WRITES.add(task)
+        task.add_done_callback(_PENDING_WRITES.discard)
+
         log_span(
             trace_context,
             "interview-prep-result",
@@ -45,13 +96,6 @@ async def run_interview_prep(
             output_data={"questions_count": len(pack_dict.get("questions", []))},
         )
 
-        # Save to jobs table
-        try:
-            db.jobs.update_interviewer(job_id, {"interview_pack": pack_dict})
-            logger.info(f"✅ Saved interview prep to job {job_id}")
-        except Exception as e:
-            logger.warning(f"⚠️ Could not save to database: {e}")
-
         logger.info(f"✅ Interview prep complete: {len(pack_dict.get('questions', []))} questions generated")
         return {"success": True, "type": "interview_prep", "interview_pack": pack_dict}
 
@@ -70,20 +114,17 @@ async def run_answer_evaluation(
     try:
         logger.info(f"📝 Evaluating answer for question {question.get('id', 'unknown')}")
 
-        from src.schemas import InterviewQuestion
-
-        question_obj = InterviewQuestion(**question)
+        question_obj = InterviewQuestion.model_validate(question)
         evaluation = await evaluate_answer(question_obj, answer)
-        eval_dict = evaluation.model_dump()
 
         log_span(
             trace_context,
             "answer-evaluation-result",
-            output_data={"score": eval_dict.get("score"), "question_id": eval_dict.get("question_id")},
+            output_data={"score": evaluation.score, "question_id": evaluation.question_id},
         )
 
-        logger.info(f"✅ Answer evaluation complete: score={eval_dict.get('score')}")
-        return {"success": True, "type": "answer_evaluation", "evaluation": eval_dict}
+        logger.info(f"✅ Answer evaluation complete: score={evaluation.score}")
+        return {"success": True, "type": "answer_evaluation", "evaluation": evaluation.model_dump()}
 
     except Exception as e:
         logger.error(f"❌ Answer evaluation error: {e}", exc_info=True)
@@ -91,6 +132,36 @@ async def run_answer_evaluation(
         return {"success": False, "type": "answer_evaluation", "error": str(e)}
 
 
+async def run_answer_evaluation_batch(
+    answers: list[dict[str, Any]],
+    trace_context: dict | None = None,
+) -> dict[str, Any]:
+    """Evaluate several interview answers concurrently."""
+    try:
+        logger.info(f"📝 Evaluating {len(answers)} answers")
+
+        pairs = [(InterviewQuestion.model_validate(item["question"]), item["answer"]) for item in answers]
+        evaluations = await evaluate_answers_batch(pairs)
+
+        log_span(
+            trace_context,
+            "answer-evaluation-batch-result",
+            output_data={"scores": {e.question_id: e.score for e in evaluations}},
+        )
+
+        logger.info(f"✅ Batch answer evaluation complete: {len(evaluations)} answers")
+        return {
+            "success": True,
+            "type": "answer_evaluation_batch",
+            "evaluations": [evaluation.model_dump() for evaluation in evaluations],
+        }
+
+    except Exception as e:
+        logger.error(f"❌ Batch answer evaluation error: {e}", exc_info=True)
+        log_span(trace_context, "answer-evaluation-batch-error", metadata={"error": str(e)}, level="ERROR")
+        return {"success": False, "type": "answer_evaluation_batch", "error": str(e)}
+
+
 def lambda_handler(event, context):
     """
     Lambda handler for interview preparation and answer evaluation.
@@ -112,6 +183,13 @@ def lambda_handler(event, context):
         "answer": "candidate's answer text",
         "_trace_context": {"trace_id": "...", "parent_span_id": "..."} (optional)
     }
+
+    Expected event for answer_evaluation_batch:
+    {
+        "type": "answer_evaluation_batch",
+        "answers": [{"question": {...interview question...}, "answer": "..."}, ...],
+        "_trace_context": {"trace_id": "...", "parent_span_id": "..."} (optional)
+    }
     """
     trace_ctx = extract_trace_context(event)
 
@@ -120,44 +198,64 @@ def lambda_handler(event, context):
 
     logger.info(f"🚀 Interviewer Lambda invoked: type={event_type}, job={job_id}")
 
+    trace_id = trace_ctx.get("trace_id")
+    parent_span_id = trace_ctx.get("parent_span_id")
+    metadata = _EVENT_METADATA.get(event_type) or {"event_type": event_type}
+
     with observe(
         job_id=job_id,
         agent_name="career-interviewer",
-        trace_id=trace_ctx.get("trace_id"),
-        parent_span_id=trace_ctx.get("parent_span_id"),
-        metadata={"event_type": event_type},
+        trace_id=trace_id,
+        parent_span_id=parent_span_id,
+        metadata=metadata,
     ) as trace_context:
         try:
             if event_type == "interview_prep":
                 job_profile = event.get("job_profile")
                 if not job_profile:
-                    return {"statusCode": 400, "body": json.dumps({"error": "job_profile required"})}
+                    return {"statusCode": 400, "body": _dumps({"error": "job_profile required"})}
 
                 cv_profile = event.get("cv_profile")
                 gap_analysis = event.get("gap_analysis")
 
-                result = asyncio.run(run_interview_prep(job_id, job_profile, cv_profile, gap_analysis, trace_context))
+                result = _LOOP.run_until_complete(
+                    run_interview_prep(job_id, job_profile, cv_profile, gap_analysis, trace_context)
+                )
 
             elif event_type == "answer_evaluation":
                 question = event.get("question")
                 answer = event.get("answer")
 
                 if not question or not answer:
-                    return {"statusCode": 400, "body": json.dumps({"error": "question and answer required"})}
+                    return {"statusCode": 400, "body": _dumps({"error": "question and answer required"})}
+
+                result = _LOOP.run_until_complete(run_answer_evaluation(question, answer, trace_context))
+
+            elif event_type == "answer_evaluation_batch":
+                answers = event.get("answers")
 
-                result = asyncio.run(run_answer_evaluation(question, answer, trace_context))
+                if not answers or not all(item.get("question") and item.get("answer") for item in answers):
+                    return {
+                        "statusCode": 400,
+                        "body": _dumps({"error": "answers with question and answer required"}),
+                    }
+
+                result = _LOOP.run_until_complete(run_answer_evaluation_batch(answers, trace_context))
 
             else:
-                return {"statusCode": 400, "body": json.dumps({"error": f"Invalid type: {event_type}"})}
+                return {"statusCode": 400, "body": _dumps({"error": f"Invalid type: {event_type}"})}
 
             status_code = 200 if result.get("success") else 500
             logger.info(f"{'✅' if result.get('success') else '❌'} Interviewer returning status {status_code}")
 
-            return {"statusCode": status_code, "body": json.dumps(result, default=str)}
+            return {"statusCode": status_code, "body": _dumps(result)}
 
         except Exception as e:
             logger.error(f"❌ Lambda handler error: {e}", exc_info=True)
-            return {"statusCode": 500, "body": json.dumps({"error": str(e)})}
+            return {"statusCode": 500, "body": _dumps({"error": str(e)})}
+
+        finally:
+            _LOOP.run_until_complete(_drain_pending_writes())
 
 
 if __name__ == "__main__":
@@ -170,4 +268,4 @@ if __name__ == "__main__":
     }
 
     result = lambda_handler({"type": "interview_prep", "job_id": "test", "job_profile": sample_job}, None)
-    print(json.dumps(json.loads(result["body"]), indent=2))
+    print(json.dumps(_loads(result["body"]), indent=2))
@@ -85,10 +85,11 @@ def package_lambda():
 
         run_command(docker_cmd)
 
-        # Copy Lambda handler, agent, templates, and observability
+        # Copy Lambda handler, agent, templates, vector ops, and observability
         shutil.copy(interviewer_dir / "lambda_handler.py", package_dir)
         shutil.copy(interviewer_dir / "agent.py", package_dir)
         shutil.copy(interviewer_dir / "templates.py", package_dir)
+        shutil.copy(interviewer_dir / "vector_ops.py", package_dir)
         shutil.copy(interviewer_dir / "observability.py", package_dir)
 
         # Create the zip file
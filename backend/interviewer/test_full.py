@@ -7,6 +7,7 @@ import json
 import os
 
 import boto3
+from botocore.config import Config
 from dotenv import load_dotenv
 
 load_dotenv(override=True)
@@ -17,12 +18,24 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../data
 
 from src import Database
 
+try:
+    import orjson
+
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    _loads = json.loads
+    _dumps = json.dumps
+
+# Created once so repeated invocations reuse its keep-alive HTTPS connections
+_LAMBDA = boto3.client("lambda", config=Config(max_pool_connections=50, retries={"max_attempts": 2}, read_timeout=300))
+
 
 def test_interviewer_lambda():
     """Test the Interviewer agent via Lambda invocation"""
 
     db = Database()
-    lambda_client = boto3.client("lambda")
+    lambda_client = _LAMBDA
 
     sample_job_profile = {
         "company": "TechCo",
@@ -42,16 +55,14 @@ def test_interviewer_lambda():
         response = lambda_client.invoke(
             FunctionName="career-interviewer",
             InvocationType="RequestResponse",
-            Payload=json.dumps(
-                {"type": "interview_prep", "job_id": "test-job-lambda", "job_profile": sample_job_profile}
-            ),
+            Payload=_dumps({"type": "interview_prep", "job_id": "test-job-lambda", "job_profile": sample_job_profile}),
         )
 
-        result = json.loads(response["Payload"].read())
+        result = _loads(response["Payload"].read())
         print(f"Lambda Response Status: {result.get('statusCode')}")
 
         if result.get("statusCode") == 200:
-            body = json.loads(result["body"])
+            body = _loads(result["body"])
             if body.get("interview_pack"):
                 pack = body["interview_pack"]
                 print("✅ Interview Pack Generated")
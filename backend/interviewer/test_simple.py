@@ -3,7 +3,9 @@
 Simple test for Interviewer agent - Interview Question Generation and Answer Evaluation
 """
 
+import hashlib
 import json
+from pathlib import Path
 
 from dotenv import load_dotenv
 
@@ -19,6 +21,29 @@ from lambda_handler import lambda_handler
 from src import Database
 from src.schemas import JobCreate
 
+# Set CAREERASSIST_CACHE=1 to replay stored responses for identical events instead of calling the LLM again
+RESPONSE_CACHE_DIR = Path(__file__).parent / ".cache"
+
+
+def invoke(test_event: dict) -> dict:
+    """Call lambda_handler, answering from the local response cache when enabled"""
+    if os.getenv("CAREERASSIST_CACHE") != "1":
+        return lambda_handler(test_event, None)
+
+    # job_id is a fresh database row on every run, so it is left out of the key
+    content = {k: v for k, v in test_event.items() if k != "job_id"}
+    key = hashlib.blake2b(json.dumps(content, sort_keys=True).encode(), digest_size=16).hexdigest()
+    cache_file = RESPONSE_CACHE_DIR / f"{key}.json"
+    if cache_file.exists():
+        print(f"(cached response {cache_file.name})")
+        return json.loads(cache_file.read_text())
+
+    result = lambda_handler(test_event, None)
+    if result["statusCode"] == 200:
+        RESPONSE_CACHE_DIR.mkdir(exist_ok=True)
+        cache_file.write_text(json.dumps(result))
+    return result
+
 
 def test_interviewer():
     """Test the interviewer agent with interview prep generation"""
@@ -73,7 +98,7 @@ def test_interviewer():
     print("Testing Interviewer Agent - Interview Prep...")
     print("=" * 60)
 
-    result = lambda_handler(test_event, None)
+    result = invoke(test_event)
 
     print(f"Status Code: {result['statusCode']}")
 
@@ -150,7 +175,7 @@ def test_answer_evaluation():
     print("\nTesting Interviewer Agent - Answer Evaluation...")
     print("=" * 60)
 
-    result = lambda_handler(test_event, None)
+    result = invoke(test_event)
 
     print(f"Status Code: {result['statusCode']}")
 
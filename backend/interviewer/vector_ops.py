@@ -0,0 +1,91 @@
+"""
+Local vector search used when S3 Vectors is unavailable.
+
+Reads the int8 knowledge-base backup written by the ingest seed script
+(backend/ingest/seed_knowledge_base.py) and ranks its vectors in memory.
+
+This is a local-development path only: the backup is not packaged into the
+Lambda and LOCAL_VECTOR_INDEX is not set there, so on Lambda the fallback
+raises and get_interview_questions reports the questions database as
+unavailable, as it did before.
+"""
+
+import functools
+import json
+import os
+
+import numpy as np
+
+LOCAL_VECTOR_INDEX = os.getenv("LOCAL_VECTOR_INDEX", "")
+
+# Rows converted to float32 at a time when scanning the int8 matrix
+SCAN_CHUNK_ROWS = 8192
+
+
+def topk_cosine(
+    matrix: np.ndarray, query: np.ndarray, k: int, row_scales: np.ndarray | None = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Find the k rows of an (N, D) matrix most similar to a query.
+
+    Float32 rows must be unit-normalized. Int8 rows need row_scales such that
+    row * scale is the unit-normalized vector; they are scanned in chunks so
+    the float32 copy never exceeds SCAN_CHUNK_ROWS rows.
+
+    Returns:
+        Tuple of (row indices, cosine scores), best match first
+    """
+    query = query / (np.linalg.norm(query) + 1e-12)
+    if row_scales is None:
+        scores = matrix @ query
+    else:
+        scores = np.empty(len(matrix), dtype=np.float32)
+        for start in range(0, len(matrix), SCAN_CHUNK_ROWS):
+            chunk = matrix[start : start + SCAN_CHUNK_ROWS]
+            scores[start : start + len(chunk)] = chunk.astype(np.float32) @ query
+        scores *= row_scales
+
+    k = min(k, len(scores))
+    if k == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+    # Partial sort: only the top k rows are ordered
+    top = np.argpartition(scores, -k)[-k:]
+    top = top[np.argsort(scores[top])[::-1]]
+    return top, scores[top]
+
+
+@functools.cache
+def load_index(path: str, vector_type: str) -> tuple[np.ndarray, np.ndarray, list[dict]]:
+    """
+    Load the backup vectors of one metadata type, once per container.
+
+    Vectors stay int8 (a quarter of the float32 size); each row's
+    quantization scale and norm are folded into one float32 row scale.
+
+    Returns:
+        Tuple of (int8 matrix, row scales, metadata per row)
+    """
+    backup = np.load(path)
+    metadatas = [json.loads(str(metadata)) for metadata in backup["metadata"]]
+    keep = [i for i, metadata in enumerate(metadatas) if metadata.get("type") == vector_type]
+
+    matrix = np.ascontiguousarray(backup["vecs"][keep])
+    norms = np.linalg.norm(matrix.astype(np.float32), axis=1)
+    row_scales = (1 / (norms + 1e-12)).astype(np.float32)
+    return matrix, row_scales, [metadatas[i] for i in keep]
+
+
+def query_local_index(embedding: list[float], top_k: int, vector_type: str) -> list[dict]:
+    """
+    Search the local index for the metadata of the top_k closest vectors of a type.
+
+    Raises:
+        FileNotFoundError: If LOCAL_VECTOR_INDEX is unset or missing
+    """
+    if not LOCAL_VECTOR_INDEX or not os.path.exists(LOCAL_VECTOR_INDEX):
+        raise FileNotFoundError("LOCAL_VECTOR_INDEX is not set or does not exist")
+
+    matrix, row_scales, metadatas = load_index(LOCAL_VECTOR_INDEX, vector_type)
+    indices, _ = topk_cosine(matrix, np.asarray(embedding, dtype=np.float32), top_k, row_scales)
+    return [metadatas[i] for i in indices]
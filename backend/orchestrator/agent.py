@@ -2,17 +2,31 @@
 Career Orchestrator Agent - Routes career requests to specialized agents.
 """
 
+import asyncio
 import json
 import logging
 import os
 import time
 from dataclasses import dataclass, field
+from functools import lru_cache
+from string import Template
 from typing import Any
 
 import boto3
 from agents import RunContextWrapper, function_tool
 from agents.extensions.models.litellm_model import LitellmModel
-from observability import get_trace_context_for_propagation, log_agent_invocation, truncate_for_trace
+from botocore.config import Config
+from observability import get_trace_context_for_propagation, log_agent_invocation
+from src.response_cache import ResponseCache
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    _loads = json.loads
+    _dumps = json.dumps
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +40,22 @@ MOCK_LAMBDAS = os.getenv("MOCK_LAMBDAS", "false").lower() == "true"
 BEDROCK_MODEL_ID = os.getenv("BEDROCK_MODEL_ID", "us.anthropic.claude-3-7-sonnet-20250219-v1:0")
 BEDROCK_REGION = os.getenv("BEDROCK_REGION", "us-west-2")
 
+# Cache of successful agent responses, keyed on the agent and its payload content.
+# Off by default: users usually re-run an analysis to get a fresh result
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "false").lower() == "true"
+RESPONSE_CACHE_TTL_SECONDS = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "3600"))
+
+# Agents whose responses depend only on their payload; Charter reads live application data
+CACHEABLE_AGENTS = frozenset({"Extractor", "Analyzer", "Interviewer"})
+
+_response_cache = ResponseCache(ttl_seconds=RESPONSE_CACHE_TTL_SECONDS)
+
+# Created once per container so invocations reuse its credentials and keep-alive connections
+_lambda_client = boto3.client(
+    "lambda",
+    config=Config(max_pool_connections=32, retries={"mode": "adaptive", "max_attempts": 3}, tcp_keepalive=True),
+)
+
 
 @dataclass
 class OrchestratorContext:
@@ -36,6 +66,24 @@ class OrchestratorContext:
     input_data: dict[str, Any]
     db: Any | None = None
     trace_context: dict[str, Any] | None = field(default=None)  # For Langfuse tracing
+    # Job row columns written by the tools, flushed in one UPDATE when the run ends
+    pending_updates: dict[str, Any] = field(default_factory=dict)
+
+
+def _is_complete(result: dict[str, Any]) -> bool:
+    """Whether a successful response has no partial failure, such as the Analyzer's failed CV rewrite."""
+    if any(value for key, value in result.items() if key.endswith("_error")):
+        return False
+    return not ("cv_rewrite" in result and result["cv_rewrite"] is None)
+
+
+def _rebind_job_id(result: dict[str, Any], job_id: str | None) -> None:
+    """Point nested results that record a job_id (e.g. an interview pack) at the current job."""
+    if job_id is None:
+        return
+    for value in result.values():
+        if isinstance(value, dict) and "job_id" in value:
+            value["job_id"] = job_id
 
 
 def invoke_lambda_agent(
@@ -49,11 +97,11 @@ def invoke_lambda_agent(
         if propagation_context:
             payload["_trace_context"] = propagation_context
             logger.info(
-                f"📊 Propagating trace context to {agent_name}: {propagation_context.get('trace_id', 'N/A')[:16]}..."
+                "📊 Propagating trace context to %s: %s...", agent_name, propagation_context.get("trace_id", "N/A")[:16]
             )
 
     if MOCK_LAMBDAS:
-        logger.info(f"MOCK: Would invoke {agent_name} ({function_name}) with payload keys: {list(payload.keys())}")
+        logger.info("MOCK: Would invoke %s (%s) with payload keys: %s", agent_name, function_name, list(payload))
         # Log mock invocation
         log_agent_invocation(
             trace_context=trace_context,
@@ -63,24 +111,38 @@ def invoke_lambda_agent(
         )
         return {"success": True, "mock": True, "agent": agent_name}
 
+    cache_key = None
+    if RESPONSE_CACHE_ENABLED and agent_name in CACHEABLE_AGENTS:
+        cache_key = ResponseCache.key(agent_name, payload)
+        cached = _response_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"♻️ {agent_name} response served from cache")
+            _rebind_job_id(cached, payload.get("job_id"))
+            log_agent_invocation(
+                trace_context=trace_context,
+                agent_name=agent_name,
+                input_payload=payload,
+                output_payload=cached,
+                metadata={"cache_hit": True},
+            )
+            return cached
+
     start_time = time.time()
     error_msg = None
     result = None
 
     try:
-        lambda_client = boto3.client("lambda")
-
         logger.info(f"🚀 Invoking {agent_name} Lambda: {function_name}")
-        response = lambda_client.invoke(
-            FunctionName=function_name, InvocationType="RequestResponse", Payload=json.dumps(payload)
+        response = _lambda_client.invoke(
+            FunctionName=function_name, InvocationType="RequestResponse", Payload=_dumps(payload)
         )
 
-        response_payload = json.loads(response["Payload"].read().decode())
+        response_payload = _loads(response["Payload"].read())
 
         if "body" in response_payload:
             body = response_payload["body"]
             if isinstance(body, str):
-                result = json.loads(body)
+                result = _loads(body)
             else:
                 result = body
         else:
@@ -92,6 +154,8 @@ def invoke_lambda_agent(
             logger.warning(f"⚠️ {agent_name} returned error: {error_msg}")
         else:
             logger.info(f"✅ {agent_name} completed successfully")
+            if cache_key and _is_complete(result):
+                _response_cache.put(cache_key, result)
 
         return result
 
@@ -102,13 +166,13 @@ def invoke_lambda_agent(
         return result
 
     finally:
-        # Log the invocation to Langfuse
+        # Log the invocation to Langfuse, which truncates the payloads only when tracing is on
         duration_ms = (time.time() - start_time) * 1000
         log_agent_invocation(
             trace_context=trace_context,
             agent_name=agent_name,
-            input_payload=truncate_for_trace(payload),
-            output_payload=truncate_for_trace(result) if result else None,
+            input_payload=payload,
+            output_payload=result,
             error=error_msg,
             duration_ms=duration_ms,
         )
@@ -121,92 +185,105 @@ def load_job_data(job_id: str, db) -> dict[str, Any]:
         if not job:
             return {}
 
-        input_data = json.loads(job.get("input_data") or "{}")
+        # The Data API client already decodes JSONB columns; only a raw string needs parsing
+        raw = job.get("input_data")
+        input_data = raw if isinstance(raw, dict) else _loads(raw) if raw else {}
         return {"job": dict(job), "input_data": input_data, "user_id": job.get("user_id")}
     except Exception as e:
         logger.warning(f"Could not load job data: {e}")
         return {}
 
 
-@function_tool
-async def invoke_extractor(wrapper: RunContextWrapper[OrchestratorContext], extraction_type: str, text: str) -> str:
-    """
-    Invoke the Extractor agent to parse CV or job posting text.
-
-    Args:
-        extraction_type: "cv" or "job"
-        text: Raw text to parse
-
-    Returns:
-        Confirmation and extracted profile summary
-    """
-    ctx = wrapper.context
-    logger.info(f"Orchestrator: Invoking Extractor for {extraction_type}")
-
-    result = invoke_lambda_agent(
+def _invoke_extractor_lambda(ctx: OrchestratorContext, extraction_type: str, text: str) -> dict[str, Any]:
+    """Call the Extractor Lambda for one CV or job posting text."""
+    return invoke_lambda_agent(
         "Extractor",
         EXTRACTOR_FUNCTION,
         {"type": extraction_type, "text": text, "job_id": ctx.job_id},
         trace_context=ctx.trace_context,
     )
 
+
+def _store_extraction(ctx: OrchestratorContext, extraction_type: str, result: dict[str, Any]) -> str:
+    """Store an Extractor result in the context and pending job updates, returning a summary for the agent."""
     if result.get("success"):
         profile = result.get("profile", {})
+        # Merged into the stored extractor_payload when the updates are flushed
+        extractor_payload = ctx.pending_updates.setdefault("extractor_payload", {})
 
         # Store extracted profile in context for subsequent agent calls
         if extraction_type == "cv":
             ctx.input_data["cv_profile"] = profile
+            extractor_payload["cv_profile"] = profile
             logger.info("Orchestrator: Stored cv_profile in context")
 
-            # Save to jobs table
-            if ctx.db:
-                try:
-                    ctx.db.client.update(
-                        "jobs", {"extractor_payload": {"cv_profile": profile}}, "id = :id::uuid", {"id": ctx.job_id}
-                    )
-                except Exception as e:
-                    logger.warning(f"Could not save extractor results: {e}")
-
             return f"CV extracted: {profile.get('name', 'Unknown')} with {len(profile.get('skills', []))} skills"
         else:
             ctx.input_data["job_profile"] = profile
+            extractor_payload["job_profile"] = profile
             logger.info("Orchestrator: Stored job_profile in context")
 
-            # Save to jobs table
-            if ctx.db:
-                try:
-                    existing = ctx.db.client.query_one(
-                        "SELECT extractor_payload FROM jobs WHERE id = :id::uuid",
-                        [{"name": "id", "value": {"stringValue": ctx.job_id}}],
-                    )
-                    extractor_payload = existing.get("extractor_payload", {}) if existing else {}
-                    if isinstance(extractor_payload, str):
-                        import json
-
-                        extractor_payload = json.loads(extractor_payload)
-                    extractor_payload["job_profile"] = profile
-                    ctx.db.client.update(
-                        "jobs", {"extractor_payload": extractor_payload}, "id = :id::uuid", {"id": ctx.job_id}
-                    )
-                except Exception as e:
-                    logger.warning(f"Could not save extractor results: {e}")
-
             return f"Job extracted: {profile.get('role_title', 'Unknown')} at {profile.get('company', 'Unknown')}"
     return f"Extraction failed: {result.get('error', 'Unknown error')}"
 
 
 @function_tool
-async def invoke_analyzer(wrapper: RunContextWrapper[OrchestratorContext], analysis_type: str) -> str:
+async def invoke_extractor(
+    wrapper: RunContextWrapper[OrchestratorContext], extraction_type: str, text: str = ""
+) -> str:
     """
-    Invoke the Analyzer agent for gap analysis or CV rewriting.
+    Invoke the Extractor agent to parse CV or job posting text.
 
     Args:
-        analysis_type: "gap_analysis", "cv_rewrite", or "full_analysis"
+        extraction_type: "cv" or "job"
+        text: Raw text to parse; leave empty to parse the CV or job text submitted with the job
 
     Returns:
-        Confirmation and analysis summary
+        Confirmation and extracted profile summary
     """
     ctx = wrapper.context
+    logger.info(f"Orchestrator: Invoking Extractor for {extraction_type}")
+
+    # The submitted texts stay out of the prompt and are read from the context here
+    text = text or ctx.input_data.get(f"{extraction_type}_text", "")
+
+    result = _invoke_extractor_lambda(ctx, extraction_type, text)
+    return _store_extraction(ctx, extraction_type, result)
+
+
+async def extract_missing_profiles(context: OrchestratorContext) -> None:
+    """
+    Parse the CV and job texts that have no profile yet, invoking the Extractor for both at once.
+
+    The two extractions are independent, so they run concurrently instead of as
+    successive agent tool calls. Any
+    profile still missing afterwards is left for the agent's extraction phase.
+    """
+    input_data = context.input_data
+    pending = [
+        (extraction_type, input_data[text_key])
+        for extraction_type, text_key, profile_key in (
+            ("cv", "cv_text", "cv_profile"),
+            ("job", "job_text", "job_profile"),
+        )
+        if input_data.get(text_key) and not input_data.get(profile_key)
+    ]
+    if not pending:
+        return
+
+    logger.info("Orchestrator: Extracting %s in parallel", [extraction_type for extraction_type, _ in pending])
+    results = await asyncio.gather(
+        *(
+            asyncio.to_thread(_invoke_extractor_lambda, context, extraction_type, text)
+            for extraction_type, text in pending
+        )
+    )
+    for (extraction_type, _), result in zip(pending, results, strict=True):
+        logger.info(f"Orchestrator: {_store_extraction(context, extraction_type, result)}")
+
+
+def _run_analyzer(ctx: OrchestratorContext, analysis_type: str) -> str:
+    """Invoke the Analyzer Lambda, keep its gap analysis in the context and queue its results."""
     logger.info(f"Orchestrator: Invoking Analyzer for {analysis_type}")
 
     result = invoke_lambda_agent(
@@ -227,39 +304,26 @@ async def invoke_analyzer(wrapper: RunContextWrapper[OrchestratorContext], analy
         gap = result.get("gap_analysis", {})
         if gap:
             ctx.input_data["gap_analysis"] = gap
-            logger.info(f"Orchestrator: Stored gap_analysis in context (fit_score={gap.get('fit_score')})")
+            logger.info("Orchestrator: Stored gap_analysis in context (fit_score=%s)", gap.get("fit_score"))
 
         # Check cv_rewrite status
         cv_rewrite = result.get("cv_rewrite")
         cv_rewrite_error = result.get("cv_rewrite_error")
 
         if cv_rewrite:
-            logger.info(f"Orchestrator: CV rewrite present with {len(cv_rewrite.get('rewritten_bullets', []))} bullets")
+            logger.info(
+                "Orchestrator: CV rewrite present with %d bullets", len(cv_rewrite.get("rewritten_bullets", []))
+            )
         elif cv_rewrite_error:
             logger.warning(f"Orchestrator: CV rewrite failed - {cv_rewrite_error}")
         else:
             logger.warning("Orchestrator: CV rewrite is missing (no data and no error)")
 
-        # Save results to jobs table
-        if ctx.db:
-            try:
-                update_data = {"analyzer_payload": result}
-                if cv_rewrite:
-                    update_data["summary_payload"] = cv_rewrite
-
-                logger.info(f"Orchestrator: Attempting to save analyzer results: {list(update_data.keys())}")
-                logger.info(f"Orchestrator: analyzer_payload keys: {list(result.keys()) if result else 'None'}")
-
-                rows_updated = ctx.db.client.update("jobs", update_data, "id = :id::uuid", {"id": ctx.job_id})
-
-                if rows_updated > 0:
-                    logger.info(
-                        f"Orchestrator: Saved analyzer results to job {ctx.job_id} (rows={rows_updated}, cv_rewrite={'present' if cv_rewrite else 'missing'})"
-                    )
-                else:
-                    logger.error(f"Orchestrator: Failed to save analyzer results - 0 rows updated for job {ctx.job_id}")
-            except Exception as e:
-                logger.error(f"Orchestrator: Error saving analyzer results: {e}", exc_info=True)
+        # Queue results for the jobs table
+        ctx.pending_updates["analyzer_payload"] = result
+        if cv_rewrite:
+            ctx.pending_updates["summary_payload"] = cv_rewrite
+        logger.info("Orchestrator: analyzer_payload keys: %s", list(result))
 
         if analysis_type == "gap_analysis":
             return f"Gap analysis complete: Fit score {gap.get('fit_score', 'N/A')}/100"
@@ -275,15 +339,8 @@ async def invoke_analyzer(wrapper: RunContextWrapper[OrchestratorContext], analy
     return f"Analysis failed: {result.get('error', 'Unknown error')}"
 
 
-@function_tool
-async def invoke_interviewer(wrapper: RunContextWrapper[OrchestratorContext]) -> str:
-    """
-    Invoke the Interviewer agent for interview preparation.
-
-    Returns:
-        Confirmation and interview prep summary
-    """
-    ctx = wrapper.context
+def _run_interviewer(ctx: OrchestratorContext) -> str:
+    """Invoke the Interviewer Lambda with the context's profiles and gap analysis and queue its results."""
     logger.info("Orchestrator: Invoking Interviewer")
 
     result = invoke_lambda_agent(
@@ -300,34 +357,56 @@ async def invoke_interviewer(wrapper: RunContextWrapper[OrchestratorContext]) ->
     )
 
     if result.get("success"):
-        # Save results to jobs table
-        if ctx.db:
-            try:
-                pack = result.get("interview_pack", {})
-                # Only save to interviewer_payload - interview_payload column doesn't exist
-                update_data = {"interviewer_payload": result}
-
-                logger.info("Orchestrator: Attempting to save interviewer results")
-                logger.info(f"Orchestrator: interviewer_payload keys: {list(result.keys()) if result else 'None'}")
-
-                rows_updated = ctx.db.client.update("jobs", update_data, "id = :id::uuid", {"id": ctx.job_id})
-
-                if rows_updated > 0:
-                    logger.info(
-                        f"Orchestrator: Saved interviewer results to job {ctx.job_id} (rows={rows_updated}, questions={len(pack.get('questions', []))})"
-                    )
-                else:
-                    logger.error(
-                        f"Orchestrator: Failed to save interviewer results - 0 rows updated for job {ctx.job_id}"
-                    )
-            except Exception as e:
-                logger.error(f"Orchestrator: Error saving interviewer results: {e}", exc_info=True)
+        # Queue results for the jobs table (only interviewer_payload - interview_payload column doesn't exist)
+        ctx.pending_updates["interviewer_payload"] = result
+        logger.info("Orchestrator: interviewer_payload keys: %s", list(result))
 
         pack = result.get("interview_pack", {})
         return f"Interview prep complete: {len(pack.get('questions', []))} questions generated"
     return f"Interview prep failed: {result.get('error', 'Unknown error')}"
 
 
+@function_tool
+async def invoke_analyzer(wrapper: RunContextWrapper[OrchestratorContext], analysis_type: str) -> str:
+    """
+    Invoke the Analyzer agent for gap analysis or CV rewriting.
+
+    Args:
+        analysis_type: "gap_analysis", "cv_rewrite", or "full_analysis"
+
+    Returns:
+        Confirmation and analysis summary
+    """
+    return _run_analyzer(wrapper.context, analysis_type)
+
+
+@function_tool
+async def invoke_interviewer(wrapper: RunContextWrapper[OrchestratorContext]) -> str:
+    """
+    Invoke the Interviewer agent for interview preparation.
+
+    Returns:
+        Confirmation and interview prep summary
+    """
+    return _run_interviewer(wrapper.context)
+
+
+@function_tool
+async def invoke_analyzer_and_prep(wrapper: RunContextWrapper[OrchestratorContext]) -> str:
+    """
+    Run the full analysis and then interview preparation in a single tool call.
+
+    The Interviewer reuses the gap analysis the Analyzer just stored in the context,
+    without another orchestrator model turn in between.
+
+    Returns:
+        Analysis summary followed by the interview prep summary
+    """
+    ctx = wrapper.context
+    analysis_summary = _run_analyzer(ctx, "full_analysis")
+    return f"{analysis_summary}\n{_run_interviewer(ctx)}"
+
+
 @function_tool
 async def invoke_charter(wrapper: RunContextWrapper[OrchestratorContext]) -> str:
     """
@@ -356,62 +435,43 @@ async def invoke_charter(wrapper: RunContextWrapper[OrchestratorContext]) -> str
     return f"Analytics failed: {result.get('error', 'Unknown error')}"
 
 
-def create_agent(
-    job_id: str, job_type: str, input_data: dict[str, Any], db=None, trace_context: dict[str, Any] | None = None
-):
-    """Create the orchestrator agent with tools and context."""
-
-    os.environ["AWS_REGION_NAME"] = BEDROCK_REGION
-    model = LitellmModel(model=f"bedrock/{BEDROCK_MODEL_ID}")
-
-    context = OrchestratorContext(
-        job_id=job_id, job_type=job_type, input_data=input_data, db=db, trace_context=trace_context
-    )
-
-    tools = [invoke_extractor, invoke_analyzer, invoke_interviewer, invoke_charter]
-
-    # Determine task based on job type
-    if job_type == "cv_parse":
-        cv_text = input_data.get("cv_text", "")
-        truncated_cv = cv_text[:2000] + ("..." if len(cv_text) > 2000 else "") if cv_text else ""
-        task = f"Parse the provided CV text using invoke_extractor with type='cv'. Job ID: {job_id}\n\nCV TEXT:\n{truncated_cv}"
-    elif job_type == "job_parse":
-        job_text = input_data.get("job_text", "")
-        truncated_job = job_text[:2000] + ("..." if len(job_text) > 2000 else "") if job_text else ""
-        task = f"Parse the provided job posting using invoke_extractor with type='job'. Job ID: {job_id}\n\nJOB TEXT:\n{truncated_job}"
-    elif job_type == "gap_analysis":
-        task = f"Run gap analysis comparing CV to job using invoke_analyzer. Job ID: {job_id}"
-    elif job_type == "cv_rewrite":
-        task = f"Generate CV rewrite using invoke_analyzer with type='cv_rewrite'. Job ID: {job_id}"
-    elif job_type == "interview_prep":
-        task = f"Generate interview preparation using invoke_interviewer. Job ID: {job_id}"
-    elif job_type == "get_analytics":
-        task = f"Generate application analytics using invoke_charter. Job ID: {job_id}"
-    elif job_type == "full_analysis":
-        # Build extraction steps based on what's missing
-        extraction_steps = []
-        cv_text = input_data.get("cv_text", "")
-        job_text = input_data.get("job_text", "")
-        cv_profile = input_data.get("cv_profile")
-        job_profile = input_data.get("job_profile")
-
-        step_num = 1
-
-        if cv_text and not cv_profile:
-            extraction_steps.append(
-                f'{step_num}. Call invoke_extractor(extraction_type="cv", text=<the CV text>) to parse the CV. WAIT for result.'
-            )
-            step_num += 1
+# Tasks for the single-step job types; only $job_id varies per job.
+# Submitted CV and job texts are never embedded: invoke_extractor reads them from the
+# context, so the prompt stays identical across jobs and Bedrock can cache its prefix
+_TASK_TEMPLATES = {
+    "cv_parse": Template("Parse the submitted CV using invoke_extractor with extraction_type='cv'. Job ID: $job_id"),
+    "job_parse": Template(
+        "Parse the submitted job posting using invoke_extractor with extraction_type='job'. Job ID: $job_id"
+    ),
+    "gap_analysis": Template("Run gap analysis comparing CV to job using invoke_analyzer. Job ID: $job_id"),
+    "cv_rewrite": Template("Generate CV rewrite using invoke_analyzer with type='cv_rewrite'. Job ID: $job_id"),
+    "interview_prep": Template("Generate interview preparation using invoke_interviewer. Job ID: $job_id"),
+    "get_analytics": Template("Generate application analytics using invoke_charter. Job ID: $job_id"),
+}
+
+
+@lru_cache(maxsize=16)
+def _full_analysis_template(cv_text: bool, cv_profile: bool, job_text: bool, job_profile: bool) -> Template:
+    """Build the full_analysis task for one combination of available inputs, leaving $job_id open."""
+    # Build extraction steps based on what's missing
+    extraction_steps = []
+    step_num = 1
+
+    if cv_text and not cv_profile:
+        extraction_steps.append(
+            f'{step_num}. Call invoke_extractor(extraction_type="cv") to parse the CV. WAIT for result.'
+        )
+        step_num += 1
 
-        if job_text and not job_profile:
-            extraction_steps.append(
-                f'{step_num}. Call invoke_extractor(extraction_type="job", text=<the job text>) to parse the job posting. WAIT for result.'
-            )
-            step_num += 1
+    if job_text and not job_profile:
+        extraction_steps.append(
+            f'{step_num}. Call invoke_extractor(extraction_type="job") to parse the job posting. WAIT for result.'
+        )
+        step_num += 1
 
-        extraction_instructions = "\n".join(extraction_steps) if extraction_steps else ""
+    extraction_instructions = "\n".join(extraction_steps) if extraction_steps else ""
 
-        task = f"""Complete full career analysis workflow for job {job_id}:
+    return Template(f"""Complete full career analysis workflow for job $job_id:
 
 INPUT DATA:
 - CV Text available: {"Yes" if cv_text else "No"}
@@ -421,13 +481,47 @@ INPUT DATA:
 
 {f"EXTRACTION PHASE (required before analysis):{chr(10)}{extraction_instructions}{chr(10)}" if extraction_instructions else ""}
 ANALYSIS PHASE:
-{step_num}. Call invoke_analyzer(analysis_type="full_analysis") and WAIT for the result.
-{step_num + 1}. Call invoke_interviewer() and WAIT for the result.
-{step_num + 2}. Only AFTER all tools have succeeded, respond with 'Done'.
+{step_num}. Call invoke_analyzer_and_prep() and WAIT for the result.
+{step_num + 1}. Only AFTER all tools have succeeded, respond with 'Done'.""")
 
-{"CV TEXT:" + chr(10) + cv_text[:2000] + ("..." if len(cv_text) > 2000 else "") if cv_text and not cv_profile else ""}
 
-{"JOB TEXT:" + chr(10) + job_text[:2000] + ("..." if len(job_text) > 2000 else "") if job_text and not job_profile else ""}"""
+_TOOLS = (invoke_extractor, invoke_analyzer, invoke_interviewer, invoke_analyzer_and_prep, invoke_charter)
+
+
+@lru_cache(maxsize=1)
+def _get_model() -> LitellmModel:
+    """Create the orchestrator model once per container; it holds no per-job state."""
+    os.environ["AWS_REGION_NAME"] = BEDROCK_REGION
+    return LitellmModel(model=f"bedrock/{BEDROCK_MODEL_ID}")
+
+
+# Built at import so the Lambda init phase, not the first job, pays for it
+_get_model()
+
+
+def create_agent(
+    job_id: str, job_type: str, input_data: dict[str, Any], db=None, trace_context: dict[str, Any] | None = None
+):
+    """Create the orchestrator agent with tools and context."""
+
+    model = _get_model()
+
+    context = OrchestratorContext(
+        job_id=job_id, job_type=job_type, input_data=input_data, db=db, trace_context=trace_context
+    )
+
+    tools = list(_TOOLS)
+
+    # Determine task based on job type
+    if job_type in _TASK_TEMPLATES:
+        task = _TASK_TEMPLATES[job_type].substitute(job_id=job_id)
+    elif job_type == "full_analysis":
+        task = _full_analysis_template(
+            bool(input_data.get("cv_text")),
+            bool(input_data.get("cv_profile")),
+            bool(input_data.get("job_text")),
+            bool(input_data.get("job_profile")),
+        ).substitute(job_id=job_id)
     else:
         task = f"Unknown job type: {job_type}. Respond with error."
 
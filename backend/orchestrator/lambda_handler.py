@@ -20,7 +20,7 @@ try:
 except ImportError:
     pass
 
-from agent import INTERVIEWER_FUNCTION, OrchestratorContext, create_agent, invoke_lambda_agent
+from agent import INTERVIEWER_FUNCTION, OrchestratorContext, create_agent, extract_missing_profiles, invoke_lambda_agent
 from observability import log_db_operation, observe
 from src import Database
 from templates import ORCHESTRATOR_INSTRUCTIONS
@@ -31,24 +31,49 @@ logger.setLevel(logging.INFO)
 db = Database()
 
 
+def flush_job_updates(job_id: str, updates: dict[str, Any], trace_context: dict[str, Any] | None = None) -> None:
+    """Write the job row columns buffered by the agent tools in a single UPDATE."""
+    if not updates:
+        return
+    rows = db.client.update("jobs", updates, "id = :id::uuid", {"id": job_id}, merge_columns=("extractor_payload",))
+    log_db_operation(trace_context, "update", "jobs", True, affected_rows=rows)
+    logger.info(f"💾 Saved {', '.join(updates)} for job {job_id} (rows={rows})")
+    updates.clear()
+
+
+def interviewer_payload_saved(job_id: str) -> bool:
+    """Check whether an earlier run of the job already saved its interviewer results."""
+    job = db.client.query_one(
+        "SELECT interviewer_payload FROM jobs WHERE id = :id::uuid",
+        [{"name": "id", "value": {"stringValue": job_id}}],
+    )
+    return bool(job and job.get("interviewer_payload"))
+
+
 async def ensure_interviewer_called(
-    job_id: str, context: OrchestratorContext, trace_context: dict[str, Any] | None = None
+    job_id: str,
+    context: OrchestratorContext,
+    trace_context: dict[str, Any] | None = None,
+    saved_check: asyncio.Task[bool] | None = None,
 ) -> None:
     """
     Ensure the interviewer agent was called for a full_analysis job.
 
     The LLM agent may skip the interviewer step, so we check if the
-    interviewer_payload exists in the database and call the interviewer
-    directly if it doesn't.
+    interviewer_payload is queued for this run or already in the database,
+    and call the interviewer directly if it isn't. saved_check is an
+    interviewer_payload_saved lookup started earlier, so the database
+    round-trip can overlap the agent run.
     """
     try:
-        # Check if interviewer was already called by querying the database
-        job = db.client.query_one(
-            "SELECT interviewer_payload FROM jobs WHERE id = :id::uuid",
-            [{"name": "id", "value": {"stringValue": job_id}}],
-        )
+        if context.pending_updates.get("interviewer_payload"):
+            logger.info(f"✅ Interviewer already called for job {job_id}")
+            return
 
-        if job and job.get("interviewer_payload"):
+        # Check if interviewer was already called by an earlier run of this job
+        if saved_check is None:
+            saved_check = asyncio.to_thread(interviewer_payload_saved, job_id)
+        if await saved_check:
             logger.info(f"✅ Interviewer already called for job {job_id}")
             return
 
@@ -69,18 +94,10 @@ async def ensure_interviewer_called(
         )
 
         if result.get("success"):
-            # Save results to jobs table
+            # Saved with the rest of the job's results
             pack = result.get("interview_pack", {})
-            update_data = {"interviewer_payload": result}
-
-            rows_updated = db.client.update("jobs", update_data, "id = :id::uuid", {"id": job_id})
-
-            if rows_updated > 0:
-                logger.info(
-                    f"✅ Saved interviewer results for job {job_id} (questions={len(pack.get('questions', []))})"
-                )
-            else:
-                logger.error(f"❌ Failed to save interviewer results - 0 rows updated for job {job_id}")
+            context.pending_updates["interviewer_payload"] = result
+            logger.info(f"✅ Interviewer results ready for job {job_id} (questions={len(pack.get('questions', []))})")
         else:
             logger.warning(f"⚠️ Interviewer call failed: {result.get('error', 'Unknown error')}")
 
@@ -97,26 +114,54 @@ async def run_orchestrator(
     job_id: str, job_type: str, input_data: dict[str, Any], trace_context: dict[str, Any] | None = None
 ) -> None:
     """Run the orchestrator agent to coordinate career analysis."""
+    # Job row results from the tools, shared by the extraction pass and the agent run
+    pending_updates: dict[str, Any] = {}
     try:
         # Update job status to processing
         db.client.update("jobs", {"status": "processing"}, "id = :id::uuid", {"id": job_id})
         log_db_operation(trace_context, "update", "jobs", True, affected_rows=1)
 
+        # Parse missing CV and job profiles concurrently up front; the agent then starts at analysis
+        if job_type == "full_analysis":
+            await extract_missing_profiles(
+                OrchestratorContext(
+                    job_id=job_id,
+                    job_type=job_type,
+                    input_data=input_data,
+                    db=db,
+                    trace_context=trace_context,
+                    pending_updates=pending_updates,
+                )
+            )
+
         # Create agent with trace context for distributed tracing
         model, tools, task, context = create_agent(job_id, job_type, input_data, db, trace_context=trace_context)
+        context.pending_updates = pending_updates
 
         with trace("Career Orchestrator"):
             agent = Agent[OrchestratorContext](
                 name="Career Orchestrator", instructions=ORCHESTRATOR_INSTRUCTIONS, model=model, tools=tools
             )
 
+            # Look up saved interviewer results while the agent runs; only needed if it skips the interviewer
+            saved_check = None
+            if job_type == "full_analysis":
+                saved_check = asyncio.create_task(asyncio.to_thread(interviewer_payload_saved, job_id))
+
             logger.info(f"🤖 Starting orchestrator agent for job {job_id}")
-            result = await Runner.run(agent, input=task, context=context, max_turns=15)
+            try:
+                result = await Runner.run(agent, input=task, context=context, max_turns=15)
+            except BaseException:
+                if saved_check:
+                    saved_check.cancel()
+                raise
 
             # For full_analysis jobs, ensure interviewer is called
             # The LLM agent may skip the interviewer step, so we call it explicitly if needed
             if job_type == "full_analysis":
-                await ensure_interviewer_called(job_id, context, trace_context)
+                await ensure_interviewer_called(job_id, context, trace_context, saved_check)
+
+            flush_job_updates(job_id, pending_updates, trace_context)
 
             # Update job status to completed (conditional: don't overwrite cancelled)
             rows = db.client.update(
@@ -131,6 +176,12 @@ async def run_orchestrator(
 
     except Exception as e:
         logger.error(f"❌ Orchestrator: Error in orchestration: {e}", exc_info=True)
+        # Keep whatever the agents produced before the failure
+        try:
+            flush_job_updates(job_id, pending_updates, trace_context)
+        except Exception as db_error:
+            logger.error(f"Failed to save partial results: {db_error}")
+            log_db_operation(trace_context, "update", "jobs", False, error=str(db_error))
         try:
             db.client.update(
                 "jobs",
@@ -196,6 +196,7 @@ def log_agent_invocation(
     output_payload: dict[str, Any] | None = None,
     error: str | None = None,
     duration_ms: float | None = None,
+    metadata: dict[str, Any] | None = None,
 ):
     """
     Log an agent invocation (Lambda call) to Langfuse.
@@ -207,6 +208,7 @@ def log_agent_invocation(
         output_payload: The response from the agent (if successful)
         error: Error message (if failed)
         duration_ms: Duration of the call in milliseconds
+        metadata: Extra span metadata (e.g. cache_hit)
     """
     if not trace_context or not trace_context.get("trace"):
         return
@@ -223,6 +225,7 @@ def log_agent_invocation(
                 "agent_invoked": agent_name,
                 "success": error is None,
                 "error": error,
+                **(metadata or {}),
             },
             level="ERROR" if error else "DEFAULT",
         )
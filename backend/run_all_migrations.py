@@ -61,7 +61,11 @@ if __name__ == "__main__":
         print("❌ Failed to create trigger function")
         # Continue anyway, might already exist or be error in this script
 
-    migrations = ["database/migrations/004_research_findings.sql", "database/migrations/005_discovered_jobs.sql"]
+    migrations = [
+        "database/migrations/004_research_findings.sql",
+        "database/migrations/005_discovered_jobs.sql",
+        "database/migrations/006_parsed_json_compression.sql",
+    ]
 
     for migration in migrations:
         if not run_migration_file(migration):
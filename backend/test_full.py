@@ -6,6 +6,7 @@ import time
 from datetime import UTC, datetime
 
 import boto3
+from botocore.config import Config
 from dotenv import load_dotenv
 
 load_dotenv(override=True)
@@ -36,7 +37,7 @@ def main():
     print("=" * 70)
 
     db = Database()
-    sqs = boto3.client("sqs")
+    sqs = boto3.client("sqs", config=Config(retries={"mode": "adaptive", "max_attempts": 5}, tcp_keepalive=True))
 
     # Setup test data
     test_user_id = setup_test_data(db)
@@ -97,16 +98,11 @@ def main():
     job_id = db.jobs.create(job_data)
     print(f"  ✓ Created job: {job_id}")
 
-    # Get queue URL
+    # Get queue URL (exact-name lookup rather than listing every queue with the prefix)
     QUEUE_NAME = "career-analysis-jobs"
-    response = sqs.list_queues(QueueNamePrefix=QUEUE_NAME)
-    queue_url = None
-    for url in response.get("QueueUrls", []):
-        if QUEUE_NAME in url:
-            queue_url = url
-            break
-
-    if not queue_url:
+    try:
+        queue_url = sqs.get_queue_url(QueueName=QUEUE_NAME)["QueueUrl"]
+    except sqs.exceptions.QueueDoesNotExist:
         print(f"  ❌ Queue {QUEUE_NAME} not found")
         return 1
 
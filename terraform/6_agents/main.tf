@@ -238,6 +238,7 @@ resource "aws_lambda_function" "orchestrator" {
       BEDROCK_REGION     = var.bedrock_region
       DEFAULT_AWS_REGION = var.aws_region
       SAGEMAKER_ENDPOINT = var.sagemaker_endpoint
+      EXTRACTOR_FUNCTION = aws_lambda_alias.extractor_live.arn
       # LangFuse observability (optional)
       LANGFUSE_PUBLIC_KEY = var.langfuse_public_key
       LANGFUSE_SECRET_KEY = var.langfuse_secret_key
@@ -277,12 +278,20 @@ resource "aws_lambda_function" "extractor" {
   timeout     = 300  # 5 minutes for extractor
   memory_size = 1024
 
+  # SnapStart snapshots the initialized agents, models and Database client,
+  # so cold starts resume from an already-imported image
+  publish = true
+  snap_start {
+    apply_on = "PublishedVersions"
+  }
+
   environment {
     variables = {
       AURORA_CLUSTER_ARN = var.aurora_cluster_arn
       AURORA_SECRET_ARN  = var.aurora_secret_arn
       DATABASE_NAME      = "career"
       BEDROCK_MODEL_ID   = var.bedrock_model_id
+      EXTRACTOR_MODEL_ID = var.extractor_model_id
       BEDROCK_REGION     = var.bedrock_region
       DEFAULT_AWS_REGION = var.aws_region
       # LangFuse observability (optional)
@@ -302,6 +311,15 @@ resource "aws_lambda_function" "extractor" {
   depends_on = [aws_s3_object.lambda_packages["extractor"]]
 }
 
+# Alias used by the orchestrator so invocations hit the SnapStart-enabled published version.
+# It follows the version each apply publishes; deploy_all_lambdas.py updates the extractor
+# in place rather than tainting it, since recreating the function would delete the alias
+resource "aws_lambda_alias" "extractor_live" {
+  name             = "live"
+  function_name    = aws_lambda_function.extractor.function_name
+  function_version = aws_lambda_function.extractor.version
+}
+
 # Analyzer (was Reporter) Lambda
 resource "aws_lambda_function" "analyzer" {
   function_name = "career-analyzer"
@@ -403,6 +421,7 @@ resource "aws_lambda_function" "interviewer" {
       AURORA_CLUSTER_ARN = var.aurora_cluster_arn
       AURORA_SECRET_ARN  = var.aurora_secret_arn
       DATABASE_NAME      = "career"
+      VECTOR_BUCKET      = var.vector_bucket
       BEDROCK_MODEL_ID   = var.bedrock_model_id
       BEDROCK_REGION     = var.bedrock_region
       DEFAULT_AWS_REGION = var.aws_region
@@ -23,6 +23,12 @@ variable "bedrock_model_id" {
   type        = string
 }
 
+variable "extractor_model_id" {
+  description = "Smaller Bedrock model ID used by the extractor; long documents escalate to bedrock_model_id"
+  type        = string
+  default     = "us.anthropic.claude-3-5-haiku-20241022-v1:0"
+}
+
 variable "bedrock_region" {
   description = "AWS region for Bedrock"
   type        = string